@@ -1,5 +1,7 @@
 import os
+import random
 
+from data_processing.rules_loader import load_rules_files
 from utils.FileProcessor import extract_fields_from_file
 from utils.TextAnalysisProcessor import TextAnalysisProcessor
 
@@ -42,6 +44,27 @@ def get_file_paths(__base_directory, __output_directory, __test_number):
     }
 
 
+def check_rules_match(filename='../data/Rules', query_count=2000):
+    """
+    检查集合字典树匹配（AssociationRule.match）与倒排索引计数匹配（match_antecedents）的结果是否一致。
+    查询集合由若干条随机规则的前件与随机的项组成。
+
+    参数:
+        filename (str): 规则文件名前缀。
+        query_count (int): 随机查询的个数。
+    """
+    rules = load_rules_files(filename)
+    items = rules.item_hasher.hash_list
+    generator = random.Random(0)
+    for _ in range(query_count):
+        feature_set = set(generator.sample(items, generator.randint(0, 10)))
+        for rule_id in generator.sample(range(rules.rules_id), generator.randint(1, 4)):
+            feature_set.update(rules.decode_items(rules.get_antecedent(rule_id)))
+        expected = rules.match_antecedents(rules.encode_items(feature_set)).tolist()
+        assert rules.match(feature_set) == expected, f'匹配结果不一致：{feature_set}'
+    print(f'{filename}：{query_count} 个查询的匹配结果一致')
+
+
 def get_all():
     root_directory = '../unmodifiable_data/'  # 根目录
 
@@ -83,6 +106,7 @@ def get_all():
         text_analysis_processor.write_rules_results_to_file(paths['rules'])
 
 
+check_rules_match()
 get_all()
 
 # # 数据集编号
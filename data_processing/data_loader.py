@@ -1,5 +1,16 @@
 import pandas as pd
 
+DEFAULT_CHUNK_SIZE = 10000  # 分块读取时每块的行数
+
+
+def _row_to_list(row):
+    """
+    将一行数据转换为 (列名, 值) 列表，去掉值为 0 的列以及空的依赖路径。
+    """
+    return [(column_name, str(value)) for column_name, value in row.items()
+            if not (isinstance(value, int) and value == 0) and not (
+                column_name == 'DEPENDENCY_PATH' and value == '[]')]
+
 
 def process_data_to_list(file_path, ignore_columns):
     """
@@ -12,10 +23,43 @@ def process_data_to_list(file_path, ignore_columns):
     processed_rows = []
 
     for index, row in df.iterrows():
-        temp_list = [(column_name, str(value)) for column_name, value in row.items()
-                     if not (isinstance(value, int) and value == 0) and not (
-                    column_name == 'DEPENDENCY_PATH' and value == '[]')]
-        processed_rows.append(temp_list)
+        processed_rows.append(_row_to_list(row))
 
     return processed_rows
 
+
+def _infer_column_dtypes(file_path, chunksize):
+    """
+    分块读取 CSV，合并各块推断出的列类型，使分块读取得到的值与整体读取一致。
+    各块类型相同时沿用该类型；均为数值（非布尔）时取 float64；否则取 object。
+    """
+    dtypes = {}
+    for chunk in pd.read_csv(file_path, chunksize=chunksize):
+        for column, dtype in chunk.dtypes.items():
+            previous = dtypes.get(column)
+            if previous is None or previous == dtype:
+                dtypes[column] = dtype
+            elif all(pd.api.types.is_numeric_dtype(x) and not pd.api.types.is_bool_dtype(x)
+                     for x in (previous, dtype)):
+                dtypes[column] = 'float64'
+            else:
+                dtypes[column] = 'object'
+    return dtypes
+
+
+def iter_data_rows(file_path, ignore_columns, chunksize=DEFAULT_CHUNK_SIZE):
+    """
+    分块读取 CSV 并逐行生成与 process_data_to_list 相同的行数据，内存中最多保存一块数据。
+    每次调用都返回新的生成器，可将 functools.partial(iter_data_rows, file_path, ignore_columns)
+    作为可重复遍历的事务传给 mining()。
+
+    :param file_path: str，CSV文件的路径
+    :param ignore_columns: list，需要忽略的列名列表
+    :param chunksize: int，每块的行数
+    :return: 生成器，逐行生成处理后的行数据
+    """
+    dtypes = _infer_column_dtypes(file_path, chunksize)
+    for chunk in pd.read_csv(file_path, chunksize=chunksize, dtype=dtypes):
+        chunk = chunk.drop(columns=ignore_columns)
+        for index, row in chunk.iterrows():
+            yield _row_to_list(row)
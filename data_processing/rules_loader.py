@@ -0,0 +1,127 @@
+import os
+import re
+
+from utils.AssociationRule import AssociationRule
+from utils.ItemHasher import ItemHasher
+
+# 项的格式为 (名称, 值)：名称为带引号的字符串；值为带引号的字符串、整数、浮点数、True、False 或 None
+_STRING = r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\""
+_ITEM_PATTERN = re.compile(r"\(\s*(" + _STRING + r")\s*,\s*(" + _STRING + r"|[^,()\s]+)\s*\)")
+# 规则中前件与后件的分隔符，引号中的内容先被项的正则匹配掉，不会被误认为分隔符
+_RULE_TOKEN_PATTERN = re.compile(_ITEM_PATTERN.pattern + r"|(===>)")
+# 倒排索引中的 (规则ID, 前件项数, 置信度)
+_POSTING_PATTERN = re.compile(r"\(\s*(\d+)\s*,\s*(\d+)\s*,\s*([-+0-9.eE]+)\s*\)")
+_ESCAPE_PATTERN = re.compile(r"\\(x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|U[0-9a-fA-F]{8}|[0-7]{1,3}|.)", re.DOTALL)
+_ESCAPES = {'\\': '\\', "'": "'", '"': '"', 'n': '\n', 't': '\t', 'r': '\r', 'a': '\a', 'b': '\b', 'f': '\f',
+            'v': '\v'}
+_CONSTANTS = {'True': True, 'False': False, 'None': None}
+
+
+def _unescape(match):
+    escape = match.group(1)
+    if escape[0] in 'xuU':
+        return chr(int(escape[1:], 16))
+    if escape[0].isdigit():
+        return chr(int(escape, 8))
+    return _ESCAPES.get(escape, '\\' + escape)
+
+
+def _parse_value(token):
+    """
+    将项中的一个值（Python 字面量的子集）转换为对应的对象。
+    """
+    if token[0] in '\'"':
+        value = token[1:-1]
+        if '\\' in value:
+            value = _ESCAPE_PATTERN.sub(_unescape, value)
+        return value
+    if token in _CONSTANTS:
+        return _CONSTANTS[token]
+    try:
+        return int(token)
+    except ValueError:
+        return float(token)
+
+
+def _parse_item(match):
+    return _parse_value(match.group(1)), _parse_value(match.group(2))
+
+
+def iter_rules_file(file_path):
+    """
+    逐行解析 AssociationRule.save_file 保存的规则文件，每行格式为 `规则ID：前件 ===> 后件,置信度`。
+
+    :param file_path: *_rules.JSON 文件路径
+    :return: 生成器，生成 (规则ID, 前件, 后件, 置信度)，前件与后件为项的元组
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for line_number, line in enumerate(file, 1):
+            line = line.strip()
+            if not line:
+                continue
+            rule_id, separator, rest = line.partition('：')
+            body, comma, confidence = rest.rpartition(',')
+            if not separator or not comma:
+                raise ValueError(f'规则文件格式错误：{file_path} 第 {line_number} 行')
+
+            antecedent = []
+            consequent = []
+            current = antecedent
+            for match in _RULE_TOKEN_PATTERN.finditer(body):
+                if match.group(3):
+                    current = consequent
+                else:
+                    current.append(_parse_item(match))
+            if current is not consequent or not antecedent or not consequent:
+                raise ValueError(f'规则文件格式错误：{file_path} 第 {line_number} 行')
+            yield int(rule_id), tuple(antecedent), tuple(consequent), float(confidence)
+
+
+def iter_inverted_index_file(file_path):
+    """
+    逐行解析 AssociationRule.save_file 保存的倒排索引文件，每行格式为 `项: [(规则ID, 前件项数, 置信度), ...]`。
+
+    :param file_path: *_inverted_index.JSON 文件路径
+    :return: 生成器，生成 (项, [(规则ID, 前件项数, 置信度)])
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for line_number, line in enumerate(file, 1):
+            line = line.strip()
+            if not line:
+                continue
+            match = _ITEM_PATTERN.match(line)
+            if match is None or not line.startswith(': [', match.end()):
+                raise ValueError(f'倒排索引文件格式错误：{file_path} 第 {line_number} 行')
+            postings = [(int(rule_id), int(length), float(confidence))
+                        for rule_id, length, confidence in _POSTING_PATTERN.findall(line, match.end())]
+            yield _parse_item(match), postings
+
+
+def load_rules_files(filename, check_inverted_index=True):
+    """
+    读取 AssociationRule.save_file 保存的规则文件，重建可直接用于 TextAnalysisProcessor.model_analyze 的 AssociationRule。
+    倒排索引由规则重建；check_inverted_index 为 True 且倒排索引文件存在时，还会与文件中的倒排索引逐项比对。
+
+    :param filename: 保存时使用的文件名前缀，如 'data/Rules'
+    :param check_inverted_index: 是否与 *_inverted_index.JSON 比对
+    :return: AssociationRule，规则ID与文件一致，项的哈希值按首次出现的顺序分配
+    """
+    item_hasher = ItemHasher()
+    rules = AssociationRule()
+    for rule_id, antecedent, consequent, confidence in iter_rules_file(filename + '_rules.JSON'):
+        if rule_id != rules.rules_id:
+            raise ValueError(f'规则ID不连续：期望 {rules.rules_id}，实际 {rule_id}')
+        rules.add_rule(tuple(item_hasher.hash_many(antecedent)), tuple(item_hasher.hash_many(consequent)),
+                       confidence)
+    rules.get_original_data(item_hasher)
+
+    inverted_index_file = filename + '_inverted_index.JSON'
+    if check_inverted_index and os.path.exists(inverted_index_file):
+        count = 0
+        for item, postings in iter_inverted_index_file(inverted_index_file):
+            if item not in rules.inverted_index_dict or rules.inverted_index_dict[item] != postings:
+                raise ValueError(f'倒排索引与规则不一致：{item}')
+            count += 1
+        if count != len(rules.inverted_index_dict):
+            raise ValueError(f'倒排索引缺少项：文件中 {count} 项，规则中 {len(rules.inverted_index_dict)} 项')
+    return rules
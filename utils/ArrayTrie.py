@@ -0,0 +1,136 @@
+from array import array
+
+
+class ArrayTrie(object):
+    ROOT = 0  # 根结点的下标
+    NONE = -1  # 空结点
+
+    def __init__(self, root_count=0):
+        """
+        以并行类型数组存储的字典树，结点用下标表示，下标 0 为根结点。
+
+        item:         结点的项（哈希值），根结点为 -1
+        count:        结点计数
+        first_child:  第一个子结点的下标，-1 表示不存在
+        next_sibling: 下一个兄弟结点的下标，-1 表示不存在
+        last_child:   最后一个子结点的下标，用于按创建顺序追加子结点
+        useful:       结点是否参与关联规则挖掘
+        table_keys / table_nodes: (父结点, 项) 到子结点下标的开放寻址哈希表，同样存放在类型数组中
+        """
+        self.item = array('i', [-1])
+        self.count = array('q', [root_count])
+        self.first_child = array('i', [self.NONE])
+        self.next_sibling = array('i', [self.NONE])
+        self.last_child = array('i', [self.NONE])
+        self.useful = array('b', [1])
+        self.table_keys = array('q', [self.NONE]) * 16
+        self.table_nodes = array('i', [self.NONE]) * 16
+        self.table_mask = 15
+
+    def __len__(self):
+        return len(self.item)
+
+    @staticmethod
+    def _key(node, item):
+        # 项为非负整数且小于 2^31，父结点与项拼成一个整数作为哈希表的键
+        return (node << 32) | item
+
+    def _slot(self, key):
+        """
+        线性探测，返回 key 所在的槽位；key 不存在时返回可插入的空槽位。
+        """
+        mask = self.table_mask
+        slot = ((key >> 32) * 0x9E3779B1 + key) & mask
+        table_keys = self.table_keys
+        while table_keys[slot] != key and table_keys[slot] != self.NONE:
+            slot = (slot + 1) & mask
+        return slot
+
+    def _grow(self):
+        """
+        装载因子超过 1/2 时将哈希表扩大一倍并重新插入全部键。
+        """
+        old_keys, old_nodes = self.table_keys, self.table_nodes
+        size = len(old_keys) * 2
+        self.table_keys = array('q', [self.NONE]) * size
+        self.table_nodes = array('i', [self.NONE]) * size
+        self.table_mask = size - 1
+        for key, child in zip(old_keys, old_nodes):
+            if key != self.NONE:
+                slot = self._slot(key)
+                self.table_keys[slot] = key
+                self.table_nodes[slot] = child
+
+    def get_child(self, node, item):
+        """
+        查找 node 下项为 item 的子结点，不存在时返回 -1。
+        """
+        return self.table_nodes[self._slot(self._key(node, item))]
+
+    def has_child(self, node, item):
+        return self.get_child(node, item) != self.NONE
+
+    def add_child(self, node, item, count=1):
+        """
+        在 node 下追加项为 item 的子结点，返回子结点下标。
+        """
+        child = len(self.item)
+        self.item.append(item)
+        self.count.append(count)
+        self.first_child.append(self.NONE)
+        self.next_sibling.append(self.NONE)
+        self.last_child.append(self.NONE)
+        self.useful.append(1)
+
+        if self.first_child[node] == self.NONE:
+            self.first_child[node] = child
+        else:
+            self.next_sibling[self.last_child[node]] = child
+        self.last_child[node] = child
+
+        if 2 * len(self.item) > len(self.table_keys):
+            self._grow()
+        key = self._key(node, item)
+        slot = self._slot(key)
+        self.table_keys[slot] = key
+        self.table_nodes[slot] = child
+        return child
+
+    def ensure_child(self, node, item):
+        """
+        查找 node 下项为 item 的子结点，不存在时以计数 0 创建，返回子结点下标。
+        批量插入时调用最频繁，探测过程直接展开以减少函数调用。
+        """
+        key = (node << 32) | item
+        mask = self.table_mask
+        table_keys = self.table_keys
+        slot = ((key >> 32) * 0x9E3779B1 + key) & mask
+        current = table_keys[slot]
+        while current != key:
+            if current == self.NONE:
+                return self.add_child(node, item, 0)
+            slot = (slot + 1) & mask
+            current = table_keys[slot]
+        return self.table_nodes[slot]
+
+    def merge(self, other):
+        """
+        将另一棵字典树合并进来：相同路径的结点计数相加，新结点按 other 中的顺序追加到已有子结点之后。
+        按事务顺序依次合并各分片的字典树，结果与逐条插入全部事务相同。
+        """
+        stack = [(self.ROOT, other.ROOT)]
+        while stack:
+            node, other_node = stack.pop()
+            for other_child in other.children(other_node):
+                child = self.ensure_child(node, other.item[other_child])
+                self.count[child] += other.count[other_child]
+                stack.append((child, other_child))
+
+    def children(self, node):
+        """
+        按创建顺序遍历 node 的子结点下标。
+        """
+        child = self.first_child[node]
+        while child != self.NONE:
+            yield child
+            child = self.next_sibling[child]
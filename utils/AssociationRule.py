@@ -1,69 +1,572 @@
+import json
+import mmap
+import struct
+from array import array
+from itertools import combinations
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
 from db.DbAccessor import count_rows_by_conditions
+from utils.ItemHasher import ItemHasher
+from utils.SetTrie import FlatSetTrie, SetTrie
+
+MODEL_MAGIC = b'QWRULES\0'  # 二进制模型文件的标识
+MODEL_VERSION = 2  # 二进制模型文件格式版本
+MODEL_READABLE_VERSIONS = (1, 2)  # 可以加载的版本，版本 1 不含前件集合字典树
+MODEL_HEADER = struct.Struct('<8sIIQ')  # 标识、版本、保留字段、JSON 头部长度
+MODEL_ALIGNMENT = 8  # 各数组在文件中的起始位置按 8 字节对齐
+DECODE_CACHE_SIZE = 4096  # 视图中缓存的解码结果条数上限
+MATCH_BLOCK_SIZE = 1 << 21  # 批量匹配时每块 句子×规则 计数矩阵的元素数上限
+
+# 二进制模型中保存的数组及其类型（小端）
+MODEL_ARRAYS = (
+    ('antecedent_items', '<i4'),
+    ('antecedent_offsets', '<i4'),
+    ('consequent_items', '<i4'),
+    ('consequent_offsets', '<i4'),
+    ('confidence', '<f8'),
+    ('support', '<i4'),
+    ('posting_items', '<i4'),
+    ('posting_offsets', '<i4'),
+    ('posting_rule_ids', '<i4'),
+    ('trie_child_offsets', '<i4'),
+    ('trie_child_items', '<i4'),
+    ('trie_rule_offsets', '<i4'),
+    ('trie_rule_ids', '<i4'),
+)
+
+
+def _identity(x):
+    return x
+
+
+def _align(position):
+    return (position + MODEL_ALIGNMENT - 1) // MODEL_ALIGNMENT * MODEL_ALIGNMENT
+
+
+class DecodeCache(object):
+    """
+    容量有限的 LRU 缓存，超出容量时淘汰最久未访问的条目。
+    """
+
+    def __init__(self, maxsize=DECODE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+
+    def get(self, key):
+        value = self.data.get(key)
+        if value is not None:
+            self.data.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.data[key] = value
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+
+class RuleListView(Sequence):
+    """
+    规则列表视图：下标为规则ID，元素为（前件，后件，置信度），访问时由列式存储生成。
+    规则添加后不再改变，解码结果按规则ID缓存。
+    """
+
+    def __init__(self, rules, decode_items):
+        self.rules = rules
+        self.decode_items = decode_items  # 哈希值序列 -> 项元组
+        self.cache = DecodeCache()
+
+    def __len__(self):
+        return self.rules.rules_id
+
+    def __getitem__(self, rule_id):
+        if isinstance(rule_id, slice):
+            return [self[i] for i in range(*rule_id.indices(len(self)))]
+        if rule_id < 0:
+            rule_id += len(self)
+        if not 0 <= rule_id < len(self):
+            raise IndexError(rule_id)
+        rule = self.cache.get(rule_id)
+        if rule is None:
+            rule = (self.decode_items(self.rules.get_antecedent(rule_id)),
+                    self.decode_items(self.rules.get_consequent(rule_id)),
+                    float(self.rules.confidence[rule_id]))
+            self.cache.put(rule_id, rule)
+        return rule
+
+    def __eq__(self, other):
+        return isinstance(other, Sequence) and list(self) == list(other)
+
+
+class RulesDictView(Mapping):
+    """
+    规则字典视图：键为前件，值为 [(后件, 置信度, 规则ID)]，按前件首次出现的顺序排列。
+    """
+
+    def __init__(self, rules, decode_items, encode_item):
+        self.rules = rules
+        self.decode_items = decode_items  # 哈希值序列 -> 项元组
+        self.encode_item = encode_item  # 项 -> 哈希值，不存在时返回 None
+
+    def __getitem__(self, antecedent):
+        antecedent_hashed = tuple(self.encode_item(item) for item in antecedent)
+        rule_ids = self.rules.group_by_antecedent()[antecedent_hashed]
+        confidence = self.rules.confidence
+        return [(self.decode_items(self.rules.get_consequent(rule_id)), float(confidence[rule_id]), rule_id)
+                for rule_id in rule_ids]
+
+    def __iter__(self):
+        for antecedent_hashed in self.rules.group_by_antecedent():
+            yield self.decode_items(antecedent_hashed)
+
+    def __len__(self):
+        return len(self.rules.group_by_antecedent())
+
+
+class InvertedIndexView(Mapping):
+    """
+    倒排索引视图：键为前件中的项，值为包含该项的 [(规则ID, 前件项数, 置信度)]，按规则ID升序排列。
+    解码结果按项缓存，项的规则ID数组变长（添加了新规则）时重新生成。
+    """
+
+    def __init__(self, rules, decode_item, encode_item):
+        self.rules = rules
+        self.decode_item = decode_item  # 哈希值 -> 项
+        self.encode_item = encode_item  # 项 -> 哈希值，不存在时返回 None
+        self.cache = DecodeCache()
+
+    def __getitem__(self, item):
+        item_hashed = self.encode_item(item)
+        rule_ids = self.rules.postings[item_hashed]
+        cached = self.cache.get(item_hashed)
+        if cached is not None and len(cached) == len(rule_ids):
+            return cached
+        offsets = self.rules.antecedent_offsets
+        confidence = self.rules.confidence
+        entries = [(rule_id, int(offsets[rule_id + 1] - offsets[rule_id]), float(confidence[rule_id]))
+                   for rule_id in rule_ids.tolist()]
+        self.cache.put(item_hashed, entries)
+        return entries
+
+    def __contains__(self, item):
+        return self.encode_item(item) in self.rules.postings
+
+    def __iter__(self):
+        for item_hashed in self.rules.postings:
+            yield self.decode_item(item_hashed)
+
+    def __len__(self):
+        return len(self.rules.postings)
 
 
 class AssociationRule:
     def __init__(self):
         """
-        初始化关联规则类，设置规则字典和倒排索引。
+        初始化关联规则类。规则以列式存储，每条规则只保存一次：
+        第 i 条规则的前件为 antecedent_items[antecedent_offsets[i]:antecedent_offsets[i + 1]]，后件同理。
+        rules_list_hashed、rules_dict_hashed、inverted_index_dict_hashed 为由列式存储生成的视图。
         """
-        self.rules_dict_hashed = {}  # (哈希后)存储关联规则的字典，键为前件，值为关联规则的列表
-        self.inverted_index_dict_hashed = {}  # (哈希后)倒排索引，键为前件中的项，值为包含该项的[(关联规则的ID, 后件项数)]的列表
-        self.rules_list_hashed = []  # (哈希后)关联规则列表， 下标为规则的ID，即 rules_list_hashed[i] 存储的第i条规则， 且格式为（前件，后件，置信度）
+        self.antecedent_items = array('i')  # 全部规则前件的哈希值，首尾相接
+        self.antecedent_offsets = array('i', [0])  # 各规则前件在 antecedent_items 中的起始位置，末尾为总长度
+        self.consequent_items = array('i')  # 全部规则后件的哈希值，首尾相接
+        self.consequent_offsets = array('i', [0])  # 各规则后件在 consequent_items 中的起始位置，末尾为总长度
+        self.confidence = array('d')  # 各规则的置信度
+        self.support = array('i')  # 各规则（前件与后件的并集）的支持度，未知时为 0
+        self.postings = {}  # (哈希后)倒排索引，键为前件中的项，值为包含该项的规则ID数组
+        self._antecedent_groups = None  # 前件到规则ID列表的缓存，由 group_by_antecedent 生成
+        self._antecedent_groups_size = 0
+        self._csr_index = None  # CSR 格式倒排索引的缓存，由 csr_index 生成
+        self._csr_index_size = 0
+        self._set_trie = None  # 前件集合字典树，由 set_trie 生成
+        self._set_trie_size = 0
 
         self.rules_dict = {}  # 存储关联规则的字典，键为前件，值为关联规则的列表
         self.inverted_index_dict = {}  # 倒排索引，键为前件中的项，值为包含该项的[(关联规则的ID, 后件项数)]的列表
         self.rules_list = []  # 关联规则列表， 下标为规则的ID，即 rules_list[i] 存储的第i条规则， 且格式为（前件，后件，置信度）
         self.rules_id = 0
+        self.item_hasher = None  # 哈希值对应的词表，由 get_original_data 设置
+
+    @property
+    def rules_list_hashed(self):
+        # (哈希后)关联规则列表， 下标为规则的ID，格式为（前件，后件，置信度）
+        return RuleListView(self, tuple)
+
+    @property
+    def rules_dict_hashed(self):
+        # (哈希后)存储关联规则的字典，键为前件，值为 [(后件, 置信度, 规则ID)]
+        return RulesDictView(self, tuple, _identity)
+
+    @property
+    def inverted_index_dict_hashed(self):
+        # (哈希后)倒排索引，键为前件中的项，值为包含该项的[(关联规则的ID, 前件项数, 置信度)]的列表
+        return InvertedIndexView(self, _identity, _identity)
+
+    def get_antecedent(self, rule_id):
+        # 列可能是 array 或（加载的模型中）NumPy 数组，统一转换为 Python 整数列表
+        return self.antecedent_items[self.antecedent_offsets[rule_id]:self.antecedent_offsets[rule_id + 1]].tolist()
+
+    def get_consequent(self, rule_id):
+        return self.consequent_items[self.consequent_offsets[rule_id]:self.consequent_offsets[rule_id + 1]].tolist()
+
+    def encode_items(self, items):
+        """
+        将项转换为哈希值，用于按哈希值匹配规则。不在词表中的项不会出现在任何规则中，直接略去。
+
+        Parameters:
+        - items: 原始项的序列
+
+        Returns:
+        - hash_values: 词表中存在的项的哈希值列表，顺序与 items 相同
+        """
+        if self.item_hasher is None:
+            return []
+        hash_dict = self.item_hasher.hash_dict
+        return [hash_dict[item] for item in items if item in hash_dict]
+
+    def decode_items(self, hash_values):
+        """
+        将哈希值序列转换为原始项的元组，只在输出结果时使用。
+        """
+        return tuple(self.item_hasher.decode_many(hash_values))
+
+    def group_by_antecedent(self):
+        """
+        按前件首次出现的顺序将规则分组，结果缓存到规则数变化为止。
+
+        Returns:
+        - groups: 字典，键为前件（哈希值元组），值为规则ID列表
+        """
+        if self._antecedent_groups is None or self._antecedent_groups_size != self.rules_id:
+            groups = {}
+            for rule_id in range(self.rules_id):
+                groups.setdefault(tuple(self.get_antecedent(rule_id)), []).append(rule_id)
+            self._antecedent_groups = groups
+            self._antecedent_groups_size = self.rules_id
+        return self._antecedent_groups
+
+    def csr_index(self):
+        """
+        将倒排索引编排为按项的哈希值索引的 CSR 格式，结果缓存到规则数变化为止。
+        哈希值为 i 的项的规则ID为 rule_ids[item_offsets[i]:item_offsets[i + 1]]，按升序排列。
+
+        Returns:
+        - (item_offsets, rule_ids, antecedent_length, confidence): NumPy 数组，
+          后两者分别为各规则的前件项数与置信度，下标为规则ID
+        """
+        if self._csr_index is None or self._csr_index_size != self.rules_id:
+            size = max(self.postings, default=-1) + 1
+            lengths = np.zeros(size + 1, dtype=np.int64)
+            for item, rule_ids in self.postings.items():
+                lengths[item + 1] = len(rule_ids)
+            item_offsets = np.cumsum(lengths)
+            rule_ids = np.empty(item_offsets[-1], dtype=np.int32)
+            for item, item_rule_ids in self.postings.items():
+                rule_ids[item_offsets[item]:item_offsets[item + 1]] = item_rule_ids
+            # 复制一份，避免导出缓冲区后 array 无法再 append
+            antecedent_length = np.diff(np.array(self.antecedent_offsets, dtype=np.int64)).astype(np.int32)
+            confidence = np.array(self.confidence, dtype=np.float64)
+            self._csr_index = (item_offsets, rule_ids, antecedent_length, confidence)
+            self._csr_index_size = self.rules_id
+        return self._csr_index
+
+    def match_antecedents(self, hash_values):
+        """
+        求前件中的项全部出现在 hash_values 中的规则，即 match_antecedents_batch 只处理一个句子的情形。
+
+        Parameters:
+        - hash_values: 句子信息中各项的哈希值
+
+        Returns:
+        - rule_ids: 完全匹配的规则ID（NumPy 数组，升序）
+        """
+        return self.match_antecedents_batch([hash_values])[1]
+
+    def match_antecedents_batch(self, hash_values_list):
+        """
+        一次求出多个句子各自完全匹配的规则。句子信息视为 句子×项 的稀疏矩阵，倒排索引视为 项×规则 的 CSR 矩阵，
+        二者相乘得到每个（句子，规则）的命中次数，命中次数等于前件项数即为完全匹配。
+        乘积按非零元展开后用 np.bincount 计数；句子按块处理，每块的计数矩阵不超过 MATCH_BLOCK_SIZE 个元素。
+        hash_values 中重复的项会重复计数。
+
+        Parameters:
+        - hash_values_list: 各句子信息中各项的哈希值
+
+        Returns:
+        - (sentence_ids, rule_ids): 完全匹配的（句子下标，规则ID）对，按句子下标、规则ID升序排列
+        """
+        item_offsets, rule_ids, antecedent_length, _ = self.csr_index()
+        rules_count = max(self.rules_id, 1)
+        block = max(MATCH_BLOCK_SIZE // rules_count, 1)
+        # 块内的键不超过 max(MATCH_BLOCK_SIZE, 规则数)，通常可以用 int32 保存
+        key_type = np.int32 if block * rules_count < 2 ** 31 else np.int64
+        offsets = item_offsets.tolist()
+        size = len(offsets) - 1
+        sentence_ids_list = [np.zeros(0, dtype=np.int64)]
+        rule_ids_list = [np.zeros(0, dtype=np.int64)]
+        for first in range(0, len(hash_values_list), block):
+            block_list = hash_values_list[first:first + block]
+            # 展开每个（句子，项）对应的规则ID数组，键为 句子在块中的下标 × 规则数 + 规则ID
+            slices = [rule_ids[offsets[item]:offsets[item + 1]]
+                      for hash_values in block_list for item in hash_values if item < size]
+            counts = [offsets[item + 1] - offsets[item]
+                      for hash_values in block_list for item in hash_values if item < size]
+            row_starts = [index * rules_count for index, hash_values in enumerate(block_list)
+                          for item in hash_values if item < size]
+            if not slices:
+                continue
+            keys = np.concatenate(slices).astype(key_type)
+            keys += np.repeat(np.asarray(row_starts, dtype=key_type), counts)
+
+            hits = np.bincount(keys, minlength=len(block_list) * rules_count).reshape(len(block_list), rules_count)
+            block_sentences, block_rules = np.nonzero(hits[:, :self.rules_id] == antecedent_length)
+            sentence_ids_list.append(block_sentences + first)
+            rule_ids_list.append(block_rules)
+        return np.concatenate(sentence_ids_list), np.concatenate(rule_ids_list).astype(np.int32)
+
+    def set_trie(self):
+        """
+        由全部规则的前件构成的集合字典树。规则只会追加，新增规则后只插入新规则的前件。
+        load_model 加载的模型直接使用文件中保存的 FlatSetTrie。
+        """
+        if self._set_trie is None:
+            self._set_trie = SetTrie()
+            self._set_trie_size = 0
+        for rule_id in range(self._set_trie_size, self.rules_id):
+            self._set_trie.add(self.get_antecedent(rule_id), rule_id)
+        self._set_trie_size = self.rules_id
+        return self._set_trie
+
+    def match(self, feature_set):
+        """
+        求前件中的项全部出现在 feature_set 中的规则，由集合字典树求出，
+        查询代价取决于匹配到的规则数，适合逐个句子查询。
+
+        Parameters:
+        - feature_set: 句子信息，原始项的集合
+
+        Returns:
+        - rule_ids: 完全匹配的规则ID列表，按规则ID升序排列
+        """
+        return self.set_trie().subsets(self.encode_items(set(feature_set)))
 
     # 获取未哈希的全部数据
     # check时必须先调用此函数
     def get_original_data(self, item_hasher):
-        for (antecedent_hashed, consequent_list_hashed) in self.rules_dict_hashed.items():
-            antecedent = item_hasher.get_items_list(antecedent_hashed)
-            consequent_list = []
-            for item in consequent_list_hashed:
-                consequent_list.append((item_hasher.get_items_list(item[0]), item[1], item[2]))
-
-            self.rules_dict[antecedent] = consequent_list
-
-        # 遍历原始字典的每一对键值对
-        for pre_item_hashed, suffix_list in self.inverted_index_dict_hashed.items():
-            # 获取原始项 pre_item
-            pre_item = item_hasher.get_item(pre_item_hashed)
+        """
+        设置词表，并以视图的形式提供解码后的 rules_list、rules_dict、inverted_index_dict。
+        视图不复制规则，访问时才解码，解码结果只保留最近访问的 DECODE_CACHE_SIZE 条。
+        推理时应通过 encode_items 与 postings 按哈希值匹配，解码只用于输出与校验。
+        """
+        self.item_hasher = item_hasher
 
-            # 将原始项 pre_item 作为新字典的键，值保持不变
-            self.inverted_index_dict[pre_item] = suffix_list
+        def encode_item(item):
+            return item_hasher.hash_dict.get(item)
 
-        #    前件        后件           置信度
-        for (antecedent, consequent, confidence) in self.rules_list_hashed:
-            self.rules_list.append(
-                (item_hasher.get_items_list(antecedent), item_hasher.get_items_list(consequent), confidence))
+        self.rules_list = RuleListView(self, item_hasher.get_items_list)
+        self.rules_dict = RulesDictView(self, item_hasher.get_items_list, encode_item)
+        self.inverted_index_dict = InvertedIndexView(self, item_hasher.get_item, encode_item)
 
-    def add_rule(self, antecedent, consequent, confidence):
+    def add_rule(self, antecedent, consequent, confidence, support=0):
         """
-        添加关联规则，并更新规则字典和倒排索引。
+        添加关联规则，并更新倒排索引。
 
         Parameters:
         - antecedent: 前件
         - consequent: 后件
         - confidence: 置信度
+        - support: 前件与后件并集的支持度
         """
         rule_id = self.rules_id  # 生成唯一的规则ID
-        self.rules_list_hashed.append((antecedent, consequent, confidence))
+        self.antecedent_items.extend(antecedent)
+        self.antecedent_offsets.append(len(self.antecedent_items))
+        self.consequent_items.extend(consequent)
+        self.consequent_offsets.append(len(self.consequent_items))
+        self.confidence.append(confidence)
+        self.support.append(support)
         self.rules_id += 1
 
-        # 添加规则到规则字典中
-        if antecedent not in self.rules_dict_hashed:
-            self.rules_dict_hashed[antecedent] = []
-
-        self.rules_dict_hashed[antecedent].append((consequent, confidence, rule_id))
-
         # 更新倒排索引
-        # 注意：格式为 前件中的项：[(规则ID, 后件项数)...]
         for item in antecedent:
-            if item not in self.inverted_index_dict_hashed:
-                self.inverted_index_dict_hashed[item] = []
-            self.inverted_index_dict_hashed[item].append((rule_id, len(antecedent), confidence))
+            if item not in self.postings:
+                self.postings[item] = array('i')
+            self.postings[item].append(rule_id)
+
+    def merge(self, other):
+        """
+        将另一组(哈希后)关联规则追加到末尾，其规则ID整体后移当前规则数。
+
+        Parameters:
+        - other: 另一个 AssociationRule，其规则应排在当前全部规则之后
+        """
+        offset = self.rules_id
+        antecedent_base = len(self.antecedent_items)
+        consequent_base = len(self.consequent_items)
+        self.antecedent_items.extend(other.antecedent_items)
+        self.antecedent_offsets.extend(x + antecedent_base for x in other.antecedent_offsets[1:])
+        self.consequent_items.extend(other.consequent_items)
+        self.consequent_offsets.extend(x + consequent_base for x in other.consequent_offsets[1:])
+        self.confidence.extend(other.confidence)
+        self.support.extend(other.support)
+        self.rules_id += other.rules_id
+
+        for item, rule_ids in other.postings.items():
+            if item not in self.postings:
+                self.postings[item] = array('i')
+            self.postings[item].extend(rule_id + offset for rule_id in rule_ids)
+
+    def find_dominated_rules(self):
+        """
+        找出被支配的规则：存在另一条后件（作为集合）相同、前件为其真子集的规则，且置信度更高，
+        或置信度相同而规则ID更小。被支配的规则匹配时，支配它的规则必然也匹配，
+        因此删去后每个句子匹配到的各后件的最大置信度不变，按置信度降序、规则ID升序首次出现的顺序也不变。
+
+        Returns:
+        - dominated: 被支配的规则ID集合
+        """
+        # 后件 -> {前件: (置信度, -规则ID)}，值越大越优
+        groups = {}
+        for rule_id in range(self.rules_id):
+            consequent = frozenset(self.get_consequent(rule_id))
+            antecedent = frozenset(self.get_antecedent(rule_id))
+            groups.setdefault(consequent, {})[antecedent] = (float(self.confidence[rule_id]), -rule_id)
+
+        dominated = set()
+        for antecedents in groups.values():
+            if len(antecedents) < 2:
+                continue
+            lengths = {len(antecedent) for antecedent in antecedents}
+            for antecedent, key in antecedents.items():
+                # 只枚举组内确实存在的前件长度的真子集
+                for length in lengths:
+                    if length >= len(antecedent):
+                        continue
+                    if any(antecedents.get(frozenset(subset), key) > key
+                           for subset in combinations(antecedent, length)):
+                        dominated.add(-key[1])
+                        break
+        return dominated
+
+    def remove_dominated_rules(self):
+        """
+        删去 find_dominated_rules 找出的规则，保留的规则按原顺序重新编号。
+        TextAnalysisProcessor.find_question_word 的结果不变，倒排索引更小，匹配更快。
+
+        Returns:
+        - rules: 新的 AssociationRule，已设置与原规则相同的词表
+        """
+        dominated = self.find_dominated_rules()
+        rules = AssociationRule()
+        for rule_id in range(self.rules_id):
+            if rule_id not in dominated:
+                rules.add_rule(self.get_antecedent(rule_id), self.get_consequent(rule_id),
+                               float(self.confidence[rule_id]), int(self.support[rule_id]))
+        if self.item_hasher is not None:
+            rules.get_original_data(self.item_hasher)
+        return rules
+
+    def save_model(self, file_path):
+        """
+        将词表、规则与倒排索引保存为二进制模型文件，需先调用 get_original_data 设置词表。
+        文件由定长头部、JSON 头部（版本、词表、各数组的位置）和按 8 字节对齐的小端数组组成，
+        倒排索引按 CSR 格式保存：posting_items[i] 的规则ID为 posting_rule_ids[posting_offsets[i]:posting_offsets[i + 1]]。
+        前件集合字典树按 SetTrie.flatten 展开后保存，加载后 match 直接在映射的页面上查询。
+
+        Parameters:
+        - file_path: 模型文件路径
+        """
+        if self.item_hasher is None:
+            raise ValueError('保存模型前需先调用 get_original_data 设置词表')
+
+        posting_offsets = [0]
+        posting_rule_ids = []
+        for rule_ids in self.postings.values():
+            posting_rule_ids.extend(rule_ids)
+            posting_offsets.append(len(posting_rule_ids))
+        trie_child_offsets, trie_child_items, trie_rule_offsets, trie_rule_ids = self.set_trie().flatten()
+        columns = {
+            'antecedent_items': self.antecedent_items,
+            'antecedent_offsets': self.antecedent_offsets,
+            'consequent_items': self.consequent_items,
+            'consequent_offsets': self.consequent_offsets,
+            'confidence': self.confidence,
+            'support': self.support,
+            'posting_items': list(self.postings.keys()),
+            'posting_offsets': posting_offsets,
+            'posting_rule_ids': posting_rule_ids,
+            'trie_child_offsets': trie_child_offsets,
+            'trie_child_items': trie_child_items,
+            'trie_rule_offsets': trie_rule_offsets,
+            'trie_rule_ids': trie_rule_ids,
+        }
+
+        arrays = {}
+        layout = {}
+        position = 0
+        for name, dtype in MODEL_ARRAYS:
+            arrays[name] = np.asarray(columns[name], dtype=dtype)
+            layout[name] = [dtype, position, len(arrays[name])]
+            position = _align(position + arrays[name].nbytes)
+        header = json.dumps({'rules': self.rules_id, 'items': self.item_hasher.hash_list, 'arrays': layout},
+                            ensure_ascii=False).encode('utf-8')
+
+        with open(file_path, 'wb') as file:
+            file.write(MODEL_HEADER.pack(MODEL_MAGIC, MODEL_VERSION, 0, len(header)))
+            file.write(header)
+            data_start = _align(MODEL_HEADER.size + len(header))
+            for name, _ in MODEL_ARRAYS:
+                file.write(b'\0' * (data_start + layout[name][1] - file.tell()))
+                file.write(arrays[name].tobytes())
+        print(f"模型已保存到文件 {file_path}.")
+
+    @classmethod
+    def load_model(cls, file_path):
+        """
+        以内存映射方式加载 save_model 保存的模型，数组直接引用映射的页面，不会复制，
+        多个进程加载同一文件时共享这些页面。加载的规则只读，不能再 add_rule 或 merge。
+
+        Parameters:
+        - file_path: 模型文件路径
+
+        Returns:
+        - rules: 已设置词表的 AssociationRule
+        """
+        with open(file_path, 'rb') as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, header_length = MODEL_HEADER.unpack_from(buffer, 0)
+        if magic != MODEL_MAGIC:
+            raise ValueError(f"不是关联规则模型文件：{file_path}")
+        if version not in MODEL_READABLE_VERSIONS:
+            raise ValueError(f"不支持的模型版本：{version}")
+        header = json.loads(buffer[MODEL_HEADER.size:MODEL_HEADER.size + header_length].decode('utf-8'))
+        data_start = _align(MODEL_HEADER.size + header_length)
+
+        arrays = {}
+        for name, (dtype, offset, count) in header['arrays'].items():
+            if count == 0:
+                arrays[name] = np.zeros(0, dtype=dtype)
+            else:
+                arrays[name] = np.frombuffer(buffer, dtype=dtype, count=count, offset=data_start + offset)
+
+        rules = cls()
+        rules.antecedent_items = arrays['antecedent_items']
+        rules.antecedent_offsets = arrays['antecedent_offsets']
+        rules.consequent_items = arrays['consequent_items']
+        rules.consequent_offsets = arrays['consequent_offsets']
+        rules.confidence = arrays['confidence']
+        rules.support = arrays['support']
+        rules.rules_id = header['rules']
+        posting_offsets = arrays['posting_offsets'].tolist()
+        posting_rule_ids = arrays['posting_rule_ids']
+        rules.postings = {item: posting_rule_ids[posting_offsets[i]:posting_offsets[i + 1]]
+                          for i, item in enumerate(arrays['posting_items'].tolist())}
+        if 'trie_child_offsets' in arrays:
+            rules._set_trie = FlatSetTrie(arrays['trie_child_offsets'], arrays['trie_child_items'],
+                                          arrays['trie_rule_offsets'], arrays['trie_rule_ids'])
+            rules._set_trie_size = rules.rules_id
+        rules.get_original_data(ItemHasher.from_items(header['items']))
+        return rules
 
     def check_rules_against_db(self):
         """
@@ -148,3 +651,9 @@ class AssociationRule:
             for (pre_item, item_list) in self.inverted_index_dict.items():
                 file.write(f"{pre_item}: {item_list} \n")
         print(f"倒排索引数据已保存到文件 {inverted_index_file}.")
+
+        # 哈希后的规则需配合词表使用，词表与规则一起保存
+        if self.item_hasher is not None:
+            vocabulary_file = filename + '_vocabulary.JSON'
+            self.item_hasher.save(vocabulary_file)
+            print(f"词表已保存到文件 {vocabulary_file}.")
@@ -1,5 +1,6 @@
 import string
-from typing import List, Tuple, Dict, Set, Optional
+from itertools import zip_longest
+from typing import List, Tuple, Dict, Set, Optional, Iterable
 import re
 import stanza
 from stanza.models.common.doc import Sentence
@@ -205,8 +206,42 @@ def map_word_positions_to_relations(word: str, dependency_relations: List[Tuple[
     return position_markers
 
 
+def check_question_word(__sentence: str, question_word: str) -> None:
+    """
+    检查疑问词是否作为完整的词出现在句子中，不合法时抛出 ValueError。
+    """
+    try:
+        # 使用正则表达式进行部分匹配验证
+        assert re.search(r'\b' + re.escape(question_word) + r'\b', __sentence, re.IGNORECASE), (
+            f'疑问词不合法！\n句子：{__sentence}\n疑问词：{question_word}\n\n'
+        )
+    except AssertionError as e:
+        raise ValueError(f'处理句子时出错：\n{str(e)}')
+
+
+def find_same_dependency(question_word: str, structure_word: str,
+                         dependencies: List[Tuple[str, List[str]]]) -> Optional[List[Tuple[str, str]]]:
+    """
+    查找句型词与问题词之间的直接依存关系，见 DependencyAnalyzer.find_same_dependency。
+    """
+    dependency_list = []
+    # 遍历依存关系列表，检查句型词与问题词之间是否存在直接依存关系
+    for rel, (head_word, word) in dependencies:
+        rel = rel.upper().replace(':', '_')
+        # 检查两种情况：问题词是否依赖于句型词，或者句型词是否依赖于问题词
+        if question_word == head_word and structure_word == word:
+            dependency_list.append(('SAME_DEPENDENCY', rel + '_1'))
+        if question_word == word and structure_word == head_word:
+            dependency_list.append(('SAME_DEPENDENCY', rel + '_2'))
+
+    if not dependency_list:
+        return None
+    return dependency_list
+
+
 class DependencyAnalyzer:
-    def __init__(self, model_dir: str, _sentences_list: List[str], question_word_list: List[str]):
+    def __init__(self, model_dir: str, _sentences_list: Iterable[str], question_word_list: Iterable[str],
+                 nlp: Optional[stanza.Pipeline] = None, lazy: bool = False):
         """
         初始化 DependencyAnalyzer 类。
 
@@ -214,9 +249,13 @@ class DependencyAnalyzer:
         - model_dir (str): Stanza NLP 模型的自定义目录位置。
         - sentences_list (List[str]): 句子列表。
         - question_word_list (List[str]): 对应每个句子的疑问词列表。
+        - nlp (Optional[stanza.Pipeline]): 已加载的 NLP Pipeline，分批处理时复用，避免每批重新加载模型。
+        - lazy (bool): 为 True 时初始化不解析句子，只能调用 iter_all_information，每次遍历时逐句解析且不保存解析结果；
+          句子与疑问词可以是可重复遍历的任意对象（如按需读取文件的对象）。
         """
         self.model_dir = model_dir  # 目录
-        self.nlp = None
+        self.nlp = nlp
+        self.lazy = lazy
         self.all_words_dependencies_list = []  # 所有句子的单词的依赖结构
         self.all_words_pos_list = []  # 所有句子的单词及其词性
         self.structure_words_and_pos_list = []  # 所有句子的句型词及其词性
@@ -229,18 +268,20 @@ class DependencyAnalyzer:
 
     def initialize(self):
         """
-        初始化 Stanza 的 NLP Pipeline。
+        初始化 Stanza 的 NLP Pipeline，已传入 Pipeline 时直接使用；lazy 为 False 时解析全部句子。
 
         在使用其他方法之前，必须调用此方法初始化 NLP Pipeline。
         """
-        try:
-            self.nlp = stanza.Pipeline('en', model_dir=self.model_dir, download_method=None,
-                                       processors='tokenize,pos,lemma,depparse', use_gpu=True)
-        except Exception as e:
-            print(f"初始化 NLP Pipeline 失败: {e}")
-            raise
+        if self.nlp is None:
+            try:
+                self.nlp = stanza.Pipeline('en', model_dir=self.model_dir, download_method=None,
+                                           processors='tokenize,pos,lemma,depparse', use_gpu=True)
+            except Exception as e:
+                print(f"初始化 NLP Pipeline 失败: {e}")
+                raise
 
-        self._process_sentences()
+        if not self.lazy:
+            self._process_sentences()
 
     def _process_sentences(self):
         """
@@ -254,44 +295,56 @@ class DependencyAnalyzer:
             )
 
             for sentence_, question_word in zip(self.sentences_list, self.question_word_list):
-                try:
-                    # 使用正则表达式进行部分匹配验证
-                    assert re.search(r'\b' + re.escape(question_word) + r'\b', sentence_, re.IGNORECASE), (
-                        f'疑问词不合法！\n句子：{sentence_}\n疑问词：{question_word}\n\n'
-                    )
-                except AssertionError as e:
-                    raise ValueError(f'处理句子时出错：\n{str(e)}')
+                check_question_word(sentence_, question_word)
 
         for index_, sentence_ in enumerate(self.sentences_list):
-            # 去除末尾的标点符号（仅在末尾是标点符号时进行去除）
-            sentence_ = sentence_.strip()
-            if sentence_ and sentence_[-1] in string.punctuation:
-                sentence_ = sentence_[:-1]
-            doc = self.nlp(sentence_)
+            question_word = self.question_word_list[index_] if len(self.question_word_list) != 0 else None
+            sentence_dependencies, sentence_words_pos, structure_word_and_pos, question_word_and_pos = (
+                self._parse_sentence(sentence_, question_word))
 
-            sentence_dependencies = []
-            sentence_words_pos = []
+            self.all_words_dependencies_list.append(sentence_dependencies)
+            self.all_words_pos_list.append(sentence_words_pos)
+            self.structure_words_and_pos_list.append(structure_word_and_pos)
+            if question_word is not None:
+                self.question_words_and_pos_list.append(question_word_and_pos)
 
-            counts_dict = dict()
+    def _parse_sentence(self, sentence_: str, question_word: Optional[str]):
+        """
+        解析一个句子。
 
-            for word in doc.sentences[0].words:
-                head_word = doc.sentences[0].words[word.head - 1].text if word.head > 0 else word.text
-                if word.deprel not in counts_dict:
-                    counts_dict[word.deprel] = 0
-                else:
-                    counts_dict[word.deprel] += 1
-                sentence_dependencies.append((f'{word.deprel}_{counts_dict[word.deprel]}', [head_word, word.text]))
-                sentence_words_pos.append((word.text, word.xpos, word.upos))
+        参数:
+        - sentence_ (str): 句子。
+        - question_word (Optional[str]): 句子的疑问词，为 None 时不查找疑问词。
 
-            self.all_words_dependencies_list.append(sentence_dependencies)
-            self.all_words_pos_list.append(sentence_words_pos)
+        返回:
+        (依赖结构, 单词及其词性, 句型词及其词性, 疑问词及其词性)，question_word 为 None 时最后一项为 None。
+        """
+        # 去除末尾的标点符号（仅在末尾是标点符号时进行去除）
+        sentence_ = sentence_.strip()
+        if sentence_ and sentence_[-1] in string.punctuation:
+            sentence_ = sentence_[:-1]
+        doc = self.nlp(sentence_)
 
-            structure_word_and_pos = find_structure_word(doc.sentences[0])
-            self.structure_words_and_pos_list.append(structure_word_and_pos)
+        sentence_dependencies = []
+        sentence_words_pos = []
+
+        counts_dict = dict()
+
+        for word in doc.sentences[0].words:
+            head_word = doc.sentences[0].words[word.head - 1].text if word.head > 0 else word.text
+            if word.deprel not in counts_dict:
+                counts_dict[word.deprel] = 0
+            else:
+                counts_dict[word.deprel] += 1
+            sentence_dependencies.append((f'{word.deprel}_{counts_dict[word.deprel]}', [head_word, word.text]))
+            sentence_words_pos.append((word.text, word.xpos, word.upos))
+
+        structure_word_and_pos = find_structure_word(doc.sentences[0])
 
-            if len(self.question_word_list) != 0:
-                __question_word_and_pos = find_question_word_and_pos(doc.sentences[0], self.question_word_list[index_])
-                self.question_words_and_pos_list.append(__question_word_and_pos)
+        question_word_and_pos = None
+        if question_word is not None:
+            question_word_and_pos = find_question_word_and_pos(doc.sentences[0], question_word)
+        return sentence_dependencies, sentence_words_pos, structure_word_and_pos, question_word_and_pos
 
     def extract_sentences_dependencies_paths(self) -> List[List[str]]:
         """
@@ -395,19 +448,8 @@ class DependencyAnalyzer:
           如果未找到任何依存关系，则返回None。
           每个元组的格式为 ('SAME_DEPENDENCY', rel_type)，其中rel_type表示依存关系的类型。
         """
-        dependency_list = []
-        # 遍历依存关系列表，检查句型词与问题词之间是否存在直接依存关系
-        for rel, (head_word, word) in self.all_words_dependencies_list[idx]:
-            rel = rel.upper().replace(':', '_')
-            # 检查两种情况：问题词是否依赖于句型词，或者句型词是否依赖于问题词
-            if self.question_word_list[idx] == head_word and self.structure_words_and_pos_list[idx][0] == word:
-                dependency_list.append(('SAME_DEPENDENCY', rel + '_1'))
-            if self.question_word_list[idx] == word and self.structure_words_and_pos_list[idx][0] == head_word:
-                dependency_list.append(('SAME_DEPENDENCY', rel + '_2'))
-
-        if not dependency_list:
-            return None
-        return dependency_list
+        return find_same_dependency(self.question_word_list[idx], self.structure_words_and_pos_list[idx][0],
+                                    self.all_words_dependencies_list[idx])
 
     def get_structure_words_in_dependencies_position(self) -> List[List[Tuple[str, int]]]:
         """
@@ -436,58 +478,98 @@ class DependencyAnalyzer:
         return question_words_in_dependencies_position
 
     def retrieve_all_information(self):
-        result_list = []
-        for __index, question_word in enumerate(self.question_word_list):
-            temp_list = []
-            # 疑问词与句型词相同
-            if question_word == self.structure_words_and_pos_list[__index][0]:
-                temp_list.append(('SAME_QS_WORD', 'True'))
-            # 是否同依赖
-            _ = self.find_same_dependency(__index)
-            if _ is not None:
-                temp_list.extend(_)
-
-            # 依赖路径
-            dependency_resolver = ShortestPathFinder(
-                question_word=self.question_word_list[__index],  # 当前句子的问题词
-                structure_word=self.structure_words_and_pos_list[__index][0],  # 当前句子的结构词
-                dependency_relations=self.all_words_dependencies_list[__index],  # 当前句子的依赖关系列表
-                _sentence=self.sentences_list[__index]  # 当前句子文本
-            )
-            sentence_dependency_paths = dependency_resolver.get_dependency_paths()
-            for sentence_dependency_path in sentence_dependency_paths:
-                temp_list.append(('DEPENDENCY_PATH', sentence_dependency_path))
+        return list(self.iter_all_information())
 
-            # 句子类型(疑问句 or 陈述句)
-            __str = '疑问句' if self.sentences_list[__index][-1] == '?' else '陈述句'
-            temp_list.append(('SENTENCE_PATTERN', __str))
-
-            # 句型词
-            temp_list.append(('SENTENCE_STRUCTURE_WORD', self.structure_words_and_pos_list[__index][0]))
-
-            # 句型词词性
-            temp_list.append(('SENTENCE_STRUCTURE_WORD_POS', self.structure_words_and_pos_list[__index][1]))
+    def iter_all_information(self):
+        """
+        逐句生成用于挖掘的事务，不保存结果列表，可直接传给 IncrementalMiner.add_transactions。
+        lazy 为 False 时全部句子的解析结果已在初始化时保存，生成器不会进一步节省内存；
+        lazy 为 True 时逐句解析，内存中只保存当前句子的解析结果，但每次遍历都会重新解析全部句子
+        （mining() 会遍历事务两次）。
 
-            # 疑问词
-            temp_list.append(('QUESTION_WORD', self.question_word_list[__index]))
+        返回:
+        生成器，每次生成一个句子的 (特征名, 值) 列表。
+        """
+        if not self.lazy:
+            for __index, question_word in enumerate(self.question_word_list):
+                yield sentence_information(self.sentences_list[__index], question_word,
+                                           self.structure_words_and_pos_list[__index],
+                                           self.question_words_and_pos_list[__index],
+                                           self.all_words_dependencies_list[__index])
+            return
 
-            # 疑问词词性
-            temp_list.append(('QUESTION_WORD_POS', self.question_words_and_pos_list[__index][1]))
+        for sentence_, question_word in zip_longest(self.sentences_list, self.question_word_list):
+            if sentence_ is None or question_word is None:
+                raise ValueError('错误，提取疑问词相关信息必须保证每个句子都有对应的疑问词！')
+            check_question_word(sentence_, question_word)
+            sentence_dependencies, _, structure_word_and_pos, question_word_and_pos = (
+                self._parse_sentence(sentence_, question_word))
+            yield sentence_information(sentence_, question_word, structure_word_and_pos, question_word_and_pos,
+                                       sentence_dependencies)
 
-            # 句型词在依赖关系中的位置
-            __structure_word = self.structure_words_and_pos_list[__index][0]
-            if __structure_word == 'How many':
-                __structure_word = 'How'
-            temp_list.extend(map_word_positions_to_relations(__structure_word,
-                                                             self.all_words_dependencies_list[__index], 'SENTENCE_'))
 
-            # 疑问词在依赖关系中的位置
-            temp_list.extend(map_word_positions_to_relations(self.question_word_list[__index],
-                                                             self.all_words_dependencies_list[__index], 'QUESTION_'))
+def sentence_information(__sentence: str, question_word: str, structure_word_and_pos: Tuple[str, str],
+                         question_word_and_pos: Tuple[str, str],
+                         dependencies: List[Tuple[str, List[str]]]) -> List[Tuple[str, object]]:
+    """
+    由一个句子的解析结果生成用于挖掘的事务。
 
-            result_list.append(temp_list)
-        return result_list
+    参数:
+    - __sentence (str): 句子。
+    - question_word (str): 疑问词。
+    - structure_word_and_pos (Tuple[str, str]): 句型词及其词性。
+    - question_word_and_pos (Tuple[str, str]): 疑问词及其词性。
+    - dependencies (List[Tuple[str, List[str]]]): 依赖结构。
 
+    返回:
+    List[Tuple[str, object]]: 句子的 (特征名, 值) 列表。
+    """
+    temp_list = []
+    # 疑问词与句型词相同
+    if question_word == structure_word_and_pos[0]:
+        temp_list.append(('SAME_QS_WORD', 'True'))
+    # 是否同依赖
+    _ = find_same_dependency(question_word, structure_word_and_pos[0], dependencies)
+    if _ is not None:
+        temp_list.extend(_)
+
+    # 依赖路径
+    dependency_resolver = ShortestPathFinder(
+        question_word=question_word,  # 当前句子的问题词
+        structure_word=structure_word_and_pos[0],  # 当前句子的结构词
+        dependency_relations=dependencies,  # 当前句子的依赖关系列表
+        _sentence=__sentence  # 当前句子文本
+    )
+    sentence_dependency_paths = dependency_resolver.get_dependency_paths()
+    for sentence_dependency_path in sentence_dependency_paths:
+        temp_list.append(('DEPENDENCY_PATH', sentence_dependency_path))
+
+    # 句子类型(疑问句 or 陈述句)
+    __str = '疑问句' if __sentence[-1] == '?' else '陈述句'
+    temp_list.append(('SENTENCE_PATTERN', __str))
+
+    # 句型词
+    temp_list.append(('SENTENCE_STRUCTURE_WORD', structure_word_and_pos[0]))
+
+    # 句型词词性
+    temp_list.append(('SENTENCE_STRUCTURE_WORD_POS', structure_word_and_pos[1]))
+
+    # 疑问词
+    temp_list.append(('QUESTION_WORD', question_word))
+
+    # 疑问词词性
+    temp_list.append(('QUESTION_WORD_POS', question_word_and_pos[1]))
+
+    # 句型词在依赖关系中的位置
+    __structure_word = structure_word_and_pos[0]
+    if __structure_word == 'How many':
+        __structure_word = 'How'
+    temp_list.extend(map_word_positions_to_relations(__structure_word, dependencies, 'SENTENCE_'))
+
+    # 疑问词在依赖关系中的位置
+    temp_list.extend(map_word_positions_to_relations(question_word, dependencies, 'QUESTION_'))
+
+    return temp_list
 
 if __name__ == '__main__':
     sentences_list = []
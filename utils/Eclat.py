@@ -0,0 +1,132 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from utils.MiningBudgetExceeded import MiningBudgetExceeded
+
+
+def _popcount_rows(bits: np.ndarray) -> np.ndarray:
+    """
+    统计位集矩阵每一行中 1 的个数。
+    """
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bits).sum(axis=1, dtype=np.int64)
+    # 旧版本 NumPy 没有 bitwise_count，按字节查表
+    table = np.array([bin(x).count('1') for x in range(256)], dtype=np.uint8)
+    return table[bits.view(np.uint8)].reshape(bits.shape[0], -1).sum(axis=1, dtype=np.int64)
+
+
+def _first_tid_rows(bits: np.ndarray) -> np.ndarray:
+    """
+    求位集矩阵每一行中最低的 1 所在的位置，即该项集最早出现的事务编号。每一行至少含一个 1。
+    """
+    first_word = (bits != 0).argmax(axis=1)
+    words = bits[np.arange(bits.shape[0]), first_word]
+    lowest_bit = words & (~words + np.uint64(1))
+    return first_word.astype(np.int64) * 64 + np.log2(lowest_bit.astype(np.float64)).astype(np.int64)
+
+
+class Eclat(object):
+    def __init__(self, items: List[int], must_antecedent, threshold, first_tid=0,
+                 max_antecedent_len=None, max_consequent_len=None, max_itemsets=None):
+        """
+        垂直位集挖掘：每个频繁单项以 uint64 位集记录包含它的事务编号，
+        项集的支持度由位集按位与后统计 1 的个数得到。
+
+        items:           按全局顺序（前件在前、频次降序、哈希值升序）排列的频繁单项
+        must_antecedent: 判断项是否必须作为前件的函数
+        threshold:       支持度阈值
+        first_tid:       第一条事务的编号
+        max_antecedent_len / max_consequent_len: 项集中前件项 / 后件项的最大个数，None 表示不限制
+        max_itemsets:    频繁项集数上限，超出时抛出 MiningBudgetExceeded
+        """
+        self.items = items
+        self.must_antecedent = must_antecedent
+        self.threshold = threshold
+        self.max_antecedent_len = float('inf') if max_antecedent_len is None else max_antecedent_len
+        self.max_consequent_len = float('inf') if max_consequent_len is None else max_consequent_len
+        self.max_itemsets = max_itemsets
+        self.tid_lists: Dict[int, List[int]] = {item: [] for item in items}
+        self.tid = first_tid
+
+    def add_transaction(self, items):
+        """
+        记录一条事务，items 为已过滤的频繁项。不含前件的事务不影响需要的项集，但仍占用一个事务编号。
+        """
+        if any(self.must_antecedent(item) for item in items):
+            for item in items:
+                self.tid_lists[item].append(self.tid)
+        self.tid += 1
+
+    def merge(self, other):
+        """
+        合并紧接在当前事务之后的另一个分片的计数结果，other 的事务编号需使用全局编号。
+        """
+        for item, tids in other.tid_lists.items():
+            self.tid_lists[item].extend(tids)
+        self.tid = max(self.tid, other.tid)
+
+    def _build_bitsets(self) -> np.ndarray:
+        """
+        将各项的事务编号列表压缩为位集矩阵，第 i 行对应 items[i]。
+        """
+        words = (self.tid + 63) // 64
+        bits = np.zeros((len(self.items), max(words, 1)), dtype=np.uint64)
+        for row, item in enumerate(self.items):
+            tids = np.asarray(self.tid_lists[item], dtype=np.int64)
+            np.bitwise_or.at(bits[row], tids >> 6, np.left_shift(np.uint64(1), (tids & 63).astype(np.uint64)))
+        return bits
+
+    def mine(self) -> Dict[Tuple[int, ...], Tuple[int, int]]:
+        """
+        挖掘至少包含一个前件项的全部频繁项集。
+
+        Returns:
+        - result: 字典，键为按全局顺序排列的项集，值为（支持度，最早出现的事务编号）
+        """
+        result = {}
+        bits = self._build_bitsets()
+        supports = _popcount_rows(bits)
+        keep = np.flatnonzero(supports >= self.threshold)
+        if len(keep) == 0:
+            return result
+        items = [self.items[i] for i in keep]
+        self._extend((), items, bits[keep], supports[keep], 0, 0, result)
+        return result
+
+    def _extend(self, prefix, items, bits, supports, pre_count, suff_count, result):
+        """
+        items/bits/supports 为 prefix 加上各候选项后的项集、位集与支持度，均已满足阈值。
+        全局顺序中前件排在后件之前，项集的第一个项必须为前件，因此 prefix 为空时只从前件开始扩展。
+        pre_count / suff_count: prefix 中前件项 / 后件项的个数
+        """
+        first_tids = _first_tid_rows(bits)
+        for i, item in enumerate(items):
+            if not prefix and not self.must_antecedent(item):
+                break
+            if self.must_antecedent(item):
+                item_pre_count, item_suff_count = pre_count + 1, suff_count
+            else:
+                item_pre_count, item_suff_count = pre_count, suff_count + 1
+            if item_pre_count > self.max_antecedent_len or item_suff_count > self.max_consequent_len:
+                continue
+            itemset = prefix + (item,)
+            result[itemset] = (int(supports[i]), int(first_tids[i]))
+            if self.max_itemsets is not None and len(result) > self.max_itemsets:
+                raise MiningBudgetExceeded(f'频繁项集数超过上限 {self.max_itemsets}')
+
+            # 前件或后件已达到项数上限时，不再与该类候选项求交
+            pre_full = item_pre_count >= self.max_antecedent_len
+            suff_full = item_suff_count >= self.max_consequent_len
+            candidates = [k for k in range(i + 1, len(items))
+                          if not (pre_full if self.must_antecedent(items[k]) else suff_full)]
+            if not candidates:
+                continue
+            # 与后续全部候选项的位集一次性按位与
+            joined = bits[candidates] & bits[i]
+            joined_supports = _popcount_rows(joined)
+            keep = np.flatnonzero(joined_supports >= self.threshold)
+            if len(keep) == 0:
+                continue
+            self._extend(itemset, [items[candidates[k]] for k in keep], joined[keep], joined_supports[keep],
+                         item_pre_count, item_suff_count, result)
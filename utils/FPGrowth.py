@@ -0,0 +1,197 @@
+from typing import Dict, List, Tuple
+
+from utils.MiningBudgetExceeded import MiningBudgetExceeded
+
+
+class FPNode(object):
+    __slots__ = ('item', 'count', 'new_count', 'tid', 'parent', 'children')
+
+    def __init__(self, item, count, tid, parent):
+        self.item = item  # 项（哈希值）
+        self.count = count  # 经过该结点的事务数
+        self.new_count = 0  # 其中上次挖掘之后新增的事务数，只在增量挖掘时使用
+        self.tid = tid  # 经过该结点的最早事务编号
+        self.parent = parent
+        self.children = {}  # 子结点字典，键为项
+
+
+class FPTree(object):
+    def __init__(self):
+        """
+        压缩前缀树（FP 树）。每条事务只插入一次，相同前缀共享结点；
+        header 为项到其全部结点的列表，用于收集条件模式基。
+        """
+        self.root = FPNode(None, 0, -1, None)
+        self.header: Dict[int, List[FPNode]] = {}
+
+    def add(self, items, count, tid, new_count=0, touched=None):
+        """
+        插入一条已排序的项序列。
+
+        Parameters:
+        - items: 按全局顺序排好的项（哈希值）
+        - count: 该序列代表的事务数
+        - tid: 该序列对应的最早事务编号
+        - new_count: 其中新增的事务数
+        - touched: 若不为 None，记录 new_count 由 0 变为非 0 的结点，便于挖掘后清零
+        """
+        node = self.root
+        for item in items:
+            child = node.children.get(item)
+            if child is None:
+                child = FPNode(item, 0, tid, node)
+                node.children[item] = child
+                self.header.setdefault(item, []).append(child)
+            elif tid < child.tid:
+                child.tid = tid
+            child.count += count
+            if new_count:
+                if touched is not None and child.new_count == 0:
+                    touched.append(child)
+                child.new_count += new_count
+            node = child
+
+    def merge(self, other):
+        """
+        将另一棵 FP 树合并进来：相同路径的结点计数相加，最早事务编号取较小值。
+        """
+        stack = [(self.root, other.root)]
+        while stack:
+            node, other_node = stack.pop()
+            for item, other_child in other_node.children.items():
+                child = node.children.get(item)
+                if child is None:
+                    child = FPNode(item, 0, other_child.tid, node)
+                    node.children[item] = child
+                    self.header.setdefault(item, []).append(child)
+                elif other_child.tid < child.tid:
+                    child.tid = other_child.tid
+                child.count += other_child.count
+                child.new_count += other_child.new_count
+                stack.append((child, other_child))
+
+
+class FPGrowth(object):
+    def __init__(self, must_antecedent, threshold, first_tid=0,
+                 max_antecedent_len=None, max_consequent_len=None, max_itemsets=None, changed_only=False):
+        """
+        基于条件模式基的频繁项集挖掘。
+        事务需预先按全局顺序（前件在前、频次降序、哈希值升序）排序，条件 FP 树沿用该顺序。
+
+        must_antecedent: 判断项是否必须作为前件的函数
+        threshold:       支持度阈值
+        first_tid:       第一条事务的编号
+        max_antecedent_len / max_consequent_len: 项集中前件项 / 后件项的最大个数，None 表示不限制
+        max_itemsets:    频繁项集数上限，超出时抛出 MiningBudgetExceeded
+        changed_only:    增量挖掘：每次 mine 只输出被上次 mine 之后新增的事务包含的项集，支持度仍按全部事务计算；
+                         此时事务应按与频次无关的固定顺序排序，追加事务后无需重建 FP 树
+        """
+        self.must_antecedent = must_antecedent
+        self.threshold = threshold
+        self.max_antecedent_len = float('inf') if max_antecedent_len is None else max_antecedent_len
+        self.max_consequent_len = float('inf') if max_consequent_len is None else max_consequent_len
+        self.max_itemsets = max_itemsets
+        self.changed_only = changed_only
+        self.tree = FPTree()
+        self.tid = first_tid
+        self.touched: List[FPNode] = []  # 增量挖掘时 new_count 非 0 的结点
+
+    def add_transaction(self, items):
+        """
+        插入一条事务，items 为已过滤、已按全局顺序排序的频繁项。
+        不含前件的事务不会产生任何需要的项集，直接跳过，但仍占用一个事务编号。
+        """
+        if items and self.must_antecedent(items[0]):
+            if self.changed_only:
+                self.tree.add(items, 1, self.tid, 1, self.touched)
+            else:
+                self.tree.add(items, 1, self.tid)
+        self.tid += 1
+
+    def merge(self, other):
+        """
+        合并另一个分片的计数结果，other 的事务编号需使用全局编号。
+        """
+        self.tree.merge(other.tree)
+        self.tid = max(self.tid, other.tid)
+
+    def mine(self) -> Dict[Tuple[int, ...], Tuple[int, int]]:
+        """
+        挖掘至少包含一个前件项的全部频繁项集；增量挖掘时只挖掘被新增事务包含的项集，之后新增计数清零。
+
+        Returns:
+        - result: 字典，键为按全局顺序排列的项集，值为（支持度，最早出现的事务编号）
+        """
+        result = {}
+        self._mine_tree(self.tree, (), 0, 0, result)
+        for node in self.touched:
+            node.new_count = 0
+        self.touched = []
+        return result
+
+    def _mine_tree(self, tree, suffix, pre_count, suff_count, result):
+        """
+        pre_count / suff_count: 后缀 suffix 中前件项 / 后件项的个数
+        """
+        for item, nodes in tree.header.items():
+            support = 0
+            tid = nodes[0].tid
+            for node in nodes:
+                support += node.count
+                if node.tid < tid:
+                    tid = node.tid
+            if support < self.threshold:
+                continue
+            # 不被任何新增事务包含的项集支持度不变
+            if self.changed_only and not any(node.new_count for node in nodes):
+                continue
+
+            itemset = (item,) + suffix
+            if self.must_antecedent(item):
+                item_pre_count, item_suff_count = pre_count + 1, suff_count
+            else:
+                item_pre_count, item_suff_count = pre_count, suff_count + 1
+            if item_pre_count > self.max_antecedent_len or item_suff_count > self.max_consequent_len:
+                continue
+            has_pre = item_pre_count > 0
+            if has_pre:
+                result[itemset] = (support, tid)
+                if self.max_itemsets is not None and len(result) > self.max_itemsets:
+                    raise MiningBudgetExceeded(f'频繁项集数超过上限 {self.max_itemsets}')
+
+            # 收集条件模式基：每个结点到根的前缀路径
+            base = []
+            counts = {}
+            for node in nodes:
+                path = []
+                parent = node.parent
+                while parent.item is not None:
+                    path.append(parent.item)
+                    counts[parent.item] = counts.get(parent.item, 0) + node.count
+                    parent = parent.parent
+                if path:
+                    base.append((path, node.count, node.new_count, node.tid))
+
+            # 前件或后件已达到项数上限时，条件模式基中不再保留该类项
+            pre_full = item_pre_count >= self.max_antecedent_len
+            suff_full = item_suff_count >= self.max_consequent_len
+            frequent = {x for x, c in counts.items()
+                        if c >= self.threshold and not (pre_full if self.must_antecedent(x) else suff_full)}
+            if self.changed_only:
+                new_items = set()
+                for path, _, new_count, _ in base:
+                    if new_count:
+                        new_items.update(path)
+                frequent &= new_items
+            if not frequent:
+                continue
+            # 后缀与条件模式基都不含前件时，继续扩展也得不到需要的项集
+            if not has_pre and not any(self.must_antecedent(x) for x in frequent):
+                continue
+
+            conditional_tree = FPTree()
+            for path, count, new_count, path_tid in base:
+                path = [x for x in reversed(path) if x in frequent]
+                if path:
+                    conditional_tree.add(path, count, path_tid, new_count)
+            self._mine_tree(conditional_tree, itemset, item_pre_count, item_suff_count, result)
@@ -0,0 +1,124 @@
+from typing import Dict, List, Tuple
+
+from utils.AssociationRule import AssociationRule
+from utils.FPGrowth import FPGrowth
+from utils.ItemHasher import ItemHasher
+
+
+class IncrementalMiner(object):
+    def __init__(self, support_threshold, confidence_threshold, max_antecedent_len=None, max_consequent_len=None):
+        """
+        可追加事务的关联规则挖掘。全部事务只以 FP 树形式保存一次，项按固定顺序（前件在前、哈希值升序）排列，
+        顺序与频次无关，因此追加事务时无需重建；每次追加由 FPGrowth 的增量模式只重新统计被新事务包含的频繁项集，
+        并只重新生成这些项集作为前件的关联规则。
+        输出的 AssociationRule 与对全部事务调用 mining() 的结果相同。
+
+        support_threshold:    支持度阈值
+        confidence_threshold: 置信度阈值
+        max_antecedent_len / max_consequent_len: 前件 / 后件的最大项数，同 mining()
+        """
+        self.support_threshold = support_threshold
+        self.confidence_threshold = confidence_threshold
+        self.ItemHasher = ItemHasher()
+        self.item_counts: Dict[int, int] = {}  # 全部单项的出现次数
+        self.itemsets: Dict[Tuple[int, ...], List[int]] = {}  # 至少含一个前件的频繁项集 -> [支持度, 最早事务编号]
+        self.consequents: Dict[Tuple[int, ...], List[Tuple[int, ...]]] = {}  # 前件 -> 与其组成频繁项集的全部后件
+        self.rules: Dict[Tuple[int, ...], List[Tuple[Tuple[int, ...], float]]] = {}  # 前件 -> [(后件, 置信度)]
+        self.must_antecedent: List[bool] = self.ItemHasher.must_antecedent  # 按哈希值记录各项是否必须作为前件
+        self.growth = FPGrowth(self.must_antecedent.__getitem__, support_threshold,
+                               max_antecedent_len=max_antecedent_len, max_consequent_len=max_consequent_len,
+                               changed_only=True)
+
+    def fixed_order_key(self, item):
+        return not self.must_antecedent[item], item
+
+    def add_transactions(self, transactions) -> AssociationRule:
+        """
+        追加事务并更新关联规则。
+
+        Parameters:
+        - transactions: 新增事务，格式与 mining() 相同；只遍历一次，可以是生成器
+
+        Returns:
+        - rules: 基于全部事务的关联规则（已调用 get_original_data）
+        """
+        for transaction in transactions:
+            items = self.ItemHasher.hash_many(transaction)
+            for item in items:
+                self.item_counts[item] = self.item_counts.get(item, 0) + 1
+            items.sort(key=self.fixed_order_key)
+            self.growth.add_transaction(items)
+
+        changed = self.growth.mine()
+
+        changed_antecedents = []
+        # 条件模式基沿用固定顺序，挖掘出的项集已按固定顺序排列
+        for itemset, (support, tid) in changed.items():
+            antecedent, consequent = self.split(itemset)
+            if itemset not in self.itemsets:
+                self.itemsets[itemset] = [support, tid]
+                if consequent:
+                    self.consequents.setdefault(antecedent, []).append(consequent)
+            else:
+                self.itemsets[itemset][0] = support
+            if not consequent:
+                changed_antecedents.append(itemset)
+
+        # 新事务若包含前件与后件的并集，则必然包含前件，因此只需重新生成支持度变化的前件对应的规则
+        for antecedent in changed_antecedents:
+            self._generate_rules(antecedent)
+        return self.build_rules()
+
+    def split(self, itemset):
+        """
+        将按固定顺序排列的项集拆分为前件部分与后件部分。
+        """
+        index = 0
+        while index < len(itemset) and self.must_antecedent[itemset[index]]:
+            index += 1
+        return itemset[:index], itemset[index:]
+
+    def _generate_rules(self, antecedent):
+        antecedent_support = self.itemsets[antecedent][0]
+        rules = []
+        for consequent in self.consequents.get(antecedent, []):
+            confidence = self.itemsets[antecedent + consequent][0] / antecedent_support
+            if confidence >= self.confidence_threshold:
+                rules.append((consequent, confidence))
+        if rules:
+            self.rules[antecedent] = rules
+        else:
+            self.rules.pop(antecedent, None)
+
+    def build_rules(self) -> AssociationRule:
+        """
+        按 mining() 的规则顺序组装 AssociationRule：项按全局顺序（前件在前、频次降序、哈希值升序）排列，
+        规则按频繁项集字典树的先序遍历排列，同一结点的子结点按最早出现的事务、前后件、全局顺序排列。
+        """
+        frequent = {item: count for item, count in self.item_counts.items() if count >= self.support_threshold}
+        must_antecedent = self.must_antecedent
+
+        def order_key(item):
+            return not must_antecedent[item], -frequent[item], item
+
+        def preorder_key(entry):
+            path = entry[0] + entry[1]
+            key = []
+            for index, item in enumerate(path):
+                prefix = tuple(sorted(path[:index + 1], key=self.fixed_order_key))
+                key.append((self.itemsets[prefix][1], must_antecedent[item], -frequent[item], item))
+            return tuple(key)
+
+        entries = []
+        for antecedent, consequent_list in self.rules.items():
+            ordered_antecedent = tuple(sorted(antecedent, key=order_key))
+            for consequent, confidence in consequent_list:
+                entries.append((ordered_antecedent, tuple(sorted(consequent, key=order_key)), confidence,
+                                self.itemsets[antecedent + consequent][0]))
+        entries.sort(key=preorder_key)
+
+        rules = AssociationRule()
+        for antecedent, consequent, confidence, support in entries:
+            rules.add_rule(antecedent, consequent, confidence, support)
+        rules.get_original_data(self.ItemHasher)
+        return rules
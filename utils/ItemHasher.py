@@ -1,4 +1,26 @@
-from typing import List, Tuple
+import json
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+VOCABULARY_VERSION = 1  # 词表文件格式版本
+
+
+def is_must_antecedent(item) -> bool:
+    """
+    判断项是否必须作为前项：疑问词相关的项只能作为后项。
+    """
+    return not (item[0].find('QUESTION') != -1 or item[0] in {'SAME_QS_WORD', 'SAME_DEPENDENCY', 'DEPENDENCY_PATH'})
+
+
+def _to_tuple(value):
+    """
+    JSON 中的项以列表保存，读取时还原为元组。
+    """
+    if isinstance(value, list):
+        return tuple(_to_tuple(x) for x in value)
+    return value
 
 
 # 哈希类
@@ -6,6 +28,12 @@ class ItemHasher:
     def __init__(self):
         self.hash_list: List[str] = []  # 存储哈希过的项的列表
         self.must_antecedent: List[bool] = []  # 存储该项是否必须作为前项的布尔值列表
+        self.hash_dict: Dict[str, int] = {}  # 项到哈希值的字典，哈希值按首次出现的顺序分配且不再改变
+        self.rank = np.zeros(0, dtype=np.int64)  # 哈希值到频繁项全局名次的数组，非频繁项为 -1，由 build_rank 设置
+        self.ranked_items = np.zeros(0, dtype=np.int64)  # 按全局名次排列的频繁项
+        self.antecedent_count = 0  # 频繁前件项的个数，名次小于该值的项为前件
+        self._rank_list: List[int] = []  # rank 的列表副本，逐条事务查表时比 NumPy 标量索引快
+        self._ranked_items_list: List[int] = []
 
     def hash(self, item: str) -> int:
         """
@@ -17,16 +45,130 @@ class ItemHasher:
         Returns:
         - index: 哈希化后的索引值（整数）
         """
-        if item not in self.hash_list:
+        hash_value = self.hash_dict.get(item)
+        if hash_value is None:
+            hash_value = len(self.hash_list)
+            self.hash_dict[item] = hash_value
             self.hash_list.append(item)
             # 判断是否必须作为前项，并记录到 must_antecedent
-            if item[0].find('QUESTION') != -1 or item[0] in {'SAME_QS_WORD', 'SAME_DEPENDENCY', 'DEPENDENCY_PATH'}:
-                self.must_antecedent.append(False)
-            else:
-                self.must_antecedent.append(True)
-            return len(self.hash_list) - 1
-        else:
-            return self.hash_list.index(item)
+            self.must_antecedent.append(is_must_antecedent(item))
+        return hash_value
+
+    def hash_many(self, items: Iterable[str]) -> List[int]:
+        """
+        批量哈希，等价于对每个项依次调用 hash。
+
+        Parameters:
+        - items: 待哈希的项
+
+        Returns:
+        - hash_values: 哈希值列表
+        """
+        hash_dict = self.hash_dict
+        hash_values = []
+        for item in items:
+            hash_value = hash_dict.get(item)
+            if hash_value is None:
+                hash_value = self.hash(item)
+            hash_values.append(hash_value)
+        return hash_values
+
+    def decode_many(self, hash_values: Iterable[int]) -> List[str]:
+        """
+        批量获取哈希值对应的原始项，哈希值必须存在。
+
+        Parameters:
+        - hash_values: 哈希值
+
+        Returns:
+        - items: 原始项列表
+        """
+        hash_list = self.hash_list
+        return [hash_list[hash_value] for hash_value in hash_values]
+
+    def save(self, file_path: str) -> None:
+        """
+        将词表按哈希值顺序保存为 JSON 文件，与模型一起保存后可用 load 恢复相同的哈希值。
+
+        Parameters:
+        - file_path: 文件路径
+        """
+        with open(file_path, 'w', encoding='utf-8') as file:
+            json.dump({'version': VOCABULARY_VERSION, 'items': self.hash_list}, file, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, file_path: str) -> 'ItemHasher':
+        """
+        从 save 保存的文件恢复词表。
+
+        Parameters:
+        - file_path: 文件路径
+
+        Returns:
+        - hasher: 哈希值与保存时一致的 ItemHasher
+        """
+        with open(file_path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        if data.get('version') != VOCABULARY_VERSION:
+            raise ValueError(f"不支持的词表版本：{data.get('version')}")
+        return cls.from_items(data['items'])
+
+    @classmethod
+    def from_items(cls, items: Iterable) -> 'ItemHasher':
+        """
+        由按哈希值顺序排列的项恢复词表，JSON 读出的列表会还原为元组。
+
+        Parameters:
+        - items: 按哈希值顺序排列的项
+
+        Returns:
+        - hasher: 第 i 个项的哈希值为 i 的 ItemHasher
+        """
+        hasher = cls()
+        hasher.hash_many(_to_tuple(item) for item in items)
+        return hasher
+
+    def build_rank(self, frequent: Dict[int, int]) -> np.ndarray:
+        """
+        按全局顺序（前件在前、频次降序、哈希值升序）为频繁项分配名次，之后排序与拆分事务只需查表。
+
+        Parameters:
+        - frequent: 频繁项（哈希值）到出现次数的字典
+
+        Returns:
+        - rank: 哈希值到名次的数组，非频繁项为 -1
+        """
+        ids = np.fromiter(frequent.keys(), dtype=np.int64, count=len(frequent))
+        counts = np.fromiter(frequent.values(), dtype=np.int64, count=len(frequent))
+        must = np.asarray(self.must_antecedent, dtype=bool)[ids]
+        # lexsort 以最后一个键为第一关键字
+        order = np.lexsort((ids, -counts, ~must))
+
+        self.rank = np.full(len(self.hash_list), -1, dtype=np.int64)
+        self.rank[ids[order]] = np.arange(len(ids), dtype=np.int64)
+        self.ranked_items = ids[order]
+        self.antecedent_count = int(must.sum())
+        self._rank_list = self.rank.tolist()
+        self._ranked_items_list = self.ranked_items.tolist()
+        return self.rank
+
+    def order_items(self, hash_values: Iterable[int]) -> Tuple[List[int], List[int]]:
+        """
+        筛选出事务中的频繁项，按全局顺序排序并拆分为前件项与后件项，需先调用 build_rank。
+
+        Parameters:
+        - hash_values: 事务中各项的哈希值
+
+        Returns:
+        - (pre_items, suff_items): 已排序的频繁前件项与频繁后件项
+        """
+        rank_list = self._rank_list
+        size = len(rank_list)
+        ranks = sorted(rank_list[x] for x in hash_values if x < size and rank_list[x] >= 0)
+        ranked_items = self._ranked_items_list
+        items = [ranked_items[r] for r in ranks]
+        split = bisect_left(ranks, self.antecedent_count)
+        return items[:split], items[split:]
 
     def get_item(self, hash_value: int) -> str:
         """
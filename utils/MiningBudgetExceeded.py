@@ -0,0 +1,4 @@
+class MiningBudgetExceeded(Exception):
+    """
+    挖掘过程中结点数或规则数超出预算时抛出。
+    """
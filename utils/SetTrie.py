@@ -0,0 +1,142 @@
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+
+
+class SetTrieNode(object):
+    __slots__ = ('children', 'rule_ids')
+
+    def __init__(self):
+        self.children: Dict[int, 'SetTrieNode'] = {}  # 子结点字典，键为项（哈希值）
+        self.rule_ids: List[int] = []  # 前件恰好在该结点结束的规则ID
+
+
+class SetTrie(object):
+    def __init__(self):
+        """
+        由规则前件构成的集合字典树，用于查询“哪些前件是给定集合的子集”。
+        前件按哈希值升序插入，查询时只沿给定集合中存在的项向下走，
+        访问的结点都是某个被包含前件的前缀，查询代价取决于匹配到的规则数而不是倒排索引的长度。
+        """
+        self.root = SetTrieNode()
+        self.size = 1  # 结点数
+
+    def add(self, antecedent: Iterable[int], rule_id: int) -> None:
+        """
+        插入一条规则的前件。前件中重复的项只插入一次，与按项计数匹配的结果一致。
+
+        Parameters:
+        - antecedent: 前件中各项的哈希值，可以重复
+        - rule_id: 规则ID
+        """
+        node = self.root
+        for item in sorted(set(antecedent)):
+            child = node.children.get(item)
+            if child is None:
+                child = SetTrieNode()
+                node.children[item] = child
+                self.size += 1
+            node = child
+        node.rule_ids.append(rule_id)
+
+    def subsets(self, items: Iterable[int]) -> List[int]:
+        """
+        求前件为 items 子集的全部规则。
+
+        Parameters:
+        - items: 查询集合中各项的哈希值，不能重复
+
+        Returns:
+        - rule_ids: 前件被 items 包含的规则ID，按规则ID升序排列
+        """
+        items = sorted(items)
+        result = []
+        # 栈中为 (结点, 之后只能使用 items 中下标不小于该值的项)
+        stack = [(self.root, 0)]
+        while stack:
+            node, start = stack.pop()
+            result.extend(node.rule_ids)
+            children = node.children
+            if not children:
+                continue
+            for index in range(start, len(items)):
+                child = children.get(items[index])
+                if child is not None:
+                    stack.append((child, index + 1))
+        result.sort()
+        return result
+
+    def flatten(self) -> Tuple[List[int], List[int], List[int], List[int]]:
+        """
+        将字典树按层序编号并展开为数组，用于保存到二进制模型后由 FlatSetTrie 直接引用。
+        层序编号下第 e 条边指向编号为 e + 1 的结点，因此不必保存子结点编号。
+
+        Returns:
+        - (child_offsets, child_items, rule_offsets, rule_ids): 结点 n 的子结点边的项为
+          child_items[child_offsets[n]:child_offsets[n + 1]]，按项升序排列；
+          前件恰好在结点 n 结束的规则ID为 rule_ids[rule_offsets[n]:rule_offsets[n + 1]]
+        """
+        child_offsets = [0]
+        child_items = []
+        rule_offsets = [0]
+        rule_ids = []
+        nodes = [self.root]
+        for node in nodes:
+            for item in sorted(node.children):
+                child_items.append(item)
+                nodes.append(node.children[item])
+            child_offsets.append(len(child_items))
+            rule_ids.extend(node.rule_ids)
+            rule_offsets.append(len(rule_ids))
+        return child_offsets, child_items, rule_offsets, rule_ids
+
+
+class FlatSetTrie(object):
+    def __init__(self, child_offsets, child_items, rule_offsets, rule_ids):
+        """
+        由 SetTrie.flatten 展开的只读集合字典树，查询结果与 SetTrie.subsets 相同。
+        参数为 int32 数组（array 或 NumPy 数组），只以 memoryview 引用而不复制；
+        引用内存映射的模型文件时，多个进程加载同一模型共享这些页面。
+        """
+        # memoryview 逐个取元素直接得到 Python 整数，比 NumPy 标量索引快
+        self.child_offsets = memoryview(child_offsets)
+        self.child_items = memoryview(child_items)
+        self.rule_offsets = memoryview(rule_offsets)
+        self.rule_ids = memoryview(rule_ids)
+        self.size = len(self.child_offsets) - 1  # 结点数
+
+    def flatten(self) -> Tuple[List[int], List[int], List[int], List[int]]:
+        return self.child_offsets.tolist(), self.child_items.tolist(), self.rule_offsets.tolist(), self.rule_ids.tolist()
+
+    def subsets(self, items: Iterable[int]) -> List[int]:
+        """
+        求前件为 items 子集的全部规则，同 SetTrie.subsets。
+
+        Parameters:
+        - items: 查询集合中各项的哈希值，不能重复
+
+        Returns:
+        - rule_ids: 前件被 items 包含的规则ID，按规则ID升序排列
+        """
+        items = sorted(items)
+        child_offsets = self.child_offsets
+        child_items = self.child_items
+        rule_offsets = self.rule_offsets
+        rule_ids = self.rule_ids
+        result = []
+        # 栈中为 (结点编号, 之后只能使用 items 中下标不小于该值的项)
+        stack = [(0, 0)]
+        while stack:
+            node, start = stack.pop()
+            result.extend(rule_ids[rule_offsets[node]:rule_offsets[node + 1]])
+            low = child_offsets[node]
+            high = child_offsets[node + 1]
+            # 子结点边与 items 都按项升序排列，二分查找的下界只需向后移动
+            for index in range(start, len(items)):
+                if low >= high:
+                    break
+                low = bisect_left(child_items, items[index], low, high)
+                if low < high and child_items[low] == items[index]:
+                    stack.append((low + 1, index + 1))
+                    low += 1
+        result.sort()
+        return result
@@ -1,11 +1,23 @@
-import heapq
 import json
-from typing import List, Tuple, Set, Dict, Optional
-
-from data_processing.data_loader import process_data_to_list
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain
+from typing import List, Tuple, Set, Dict, Optional, Iterable, Iterator, Callable
+
+from data_processing.data_loader import iter_data_rows
+from data_processing.rules_loader import load_rules_files
 from utils.AssociationRule import AssociationRule
 from utils.DependencyAnalyzer import DependencyAnalyzer
-from utils.Trie_tree import mining
+from utils.IncrementalMiner import IncrementalMiner
+from utils.Trie_tree import map_in_order, mining
+
+DEFAULT_BATCH_SIZE = 256  # analyze_stream 每批分析的句子数
+SUPPORT_THRESHOLD = 2  # 训练模型的支持度阈值
+CONFIDENCE_THRESHOLD = 0.8  # 训练模型的置信度阈值
+# 增量挖掘结果与 mining() 相同的挖掘参数，其中 engine、workers 只影响挖掘速度
+INCREMENTAL_MINING_OPTIONS = {'engine', 'workers', 'max_antecedent_len', 'max_consequent_len'}
 
 
 # 查找疑问词辅助类
@@ -24,6 +36,12 @@ class Word:
         self.words_dependencies_list = words_dependencies_list
         self.structure_word_and_pos_tuple = structure_word_and_pos_tuple
         self.information_dict = self._build_information_dict()
+        self.words = list(self.information_dict)  # 单词按 information_dict 的顺序编号
+        self.all_words_mask = (1 << len(self.words)) - 1
+        self.feature_bits: Dict[Tuple[str, ...], int] = {}  # 句中出现的特征 -> 特征位
+        self.feature_words: Dict[Tuple[str, ...], int] = {}  # 特征 -> 具有该特征的单词位掩码（倒排索引）
+        self.word_masks: List[int] = []  # 各单词特征的位掩码
+        self._build_masks()
 
     def _build_information_dict(self) -> dict:
         """
@@ -57,6 +75,43 @@ class Word:
         #     print(f'信息：{_word} : {info_dict[_word]}')
         return info_dict
 
+    def _build_masks(self) -> None:
+        """
+        将每个单词的特征编码为整数位掩码，并建立 特征 -> 单词位掩码 的倒排索引。
+        """
+        for word_index, _word in enumerate(self.words):
+            word_mask = 0
+            for feature in self.information_dict[_word]:
+                bit = self.feature_bits.setdefault(feature, len(self.feature_bits))
+                word_mask |= 1 << bit
+                self.feature_words[feature] = self.feature_words.get(feature, 0) | (1 << word_index)
+            self.word_masks.append(word_mask)
+
+    def feature_mask(self, input_set: Set[Tuple[str, ...]]) -> int:
+        """
+        特征集合的位掩码，只用于句中出现的特征。
+        """
+        feature_bits = self.feature_bits
+        mask = 0
+        for feature in input_set:
+            mask |= 1 << feature_bits[feature]
+        return mask
+
+    def matching_words_mask(self, input_set: Set[Tuple[str, ...]]) -> int:
+        """
+        求特征包含 input_set 的全部单词：按特征依次与倒排索引中的单词位掩码求与，句中没有的特征直接得到 0。
+
+        :param input_set: 待检查的特征集合
+        :return: 单词位掩码，第 i 位对应 words[i]
+        """
+        words_mask = self.all_words_mask
+        feature_words = self.feature_words
+        for feature in input_set:
+            words_mask &= feature_words.get(feature, 0)
+            if not words_mask:
+                break
+        return words_mask
+
     def check_legality(self, input_set: Set[Tuple[str, ...]], confidence: float) -> List[Tuple[str, float]]:
         """
         检查给定集合的合法性。
@@ -65,12 +120,31 @@ class Word:
         :param confidence: 置信度
         :return: 符合条件的单词及其置信度列表
         """
-        result = []
-        for _word in self.information_dict:
-            # 若输入集合中的所有特征 在[_word]集合中出现  即满足条件
-            if input_set.issubset(self.information_dict[_word]):
-                result.append((_word, confidence))
-        return result
+        # 若输入集合中的所有特征 在[_word]集合中出现  即满足条件
+        words_mask = self.matching_words_mask(input_set)
+        return [(_word, confidence) for word_index, _word in enumerate(self.words) if words_mask >> word_index & 1]
+
+
+def split_batches(sentences: Iterable[str], batch_size: int) -> Iterator[Tuple[List[str], int]]:
+    """
+    将句子按 batch_size 个一批切分，只遍历一次输入。
+
+    :param sentences: 句子，可以是生成器
+    :param batch_size: 每批的句子数
+    :return: 生成器，生成 (该批句子, 该批第一个句子的全局下标)
+    """
+    if batch_size <= 0:
+        raise ValueError(f'batch_size 必须为正整数：{batch_size}')
+    batch = []
+    start = 0
+    for sentence in sentences:
+        batch.append(sentence)
+        if len(batch) == batch_size:
+            yield batch, start
+            start += len(batch)
+            batch = []
+    if batch:
+        yield batch, start
 
 
 # 加载训练的模型并处理输入的数据
@@ -84,53 +158,184 @@ class TextAnalysisProcessor:
         self.all_words_pos_list = []  # 句子中所有词及其词性
         self.all_words_dependencies_list = []  # 依赖结构
         self.model_rules = AssociationRule()  # 模型类
+        self.model_miner: Optional[IncrementalMiner] = None  # 增量挖掘状态，第一次追加训练数据时建立
+        self.training_sources: List[Callable[[], Iterable]] = []  # 尚未交给增量挖掘的训练数据，调用后返回一次新的事务遍历
+        self.mining_options = {}  # 训练时传给 mining() 的其余参数
+        self.model_file: Optional[str] = None  # 与当前模型一致的二进制模型文件，并行推理时各进程直接映射该文件
         self.data_list = []  # 待分析句子的列表
         self.ans = []
+        self.nlp = None  # 已加载的 NLP Pipeline，多次分析时复用
+        self.nlp_model_dir = None  # nlp 对应的模型目录
 
     # 加载训练好的模型
     def load_pretrained_model(self,
                               model_csv_file: str,
-                              ignore_columns: List[str]) -> None:
+                              ignore_columns: List[str],
+                              **mining_options) -> None:
         """
         加载训练好的模型数据。
 
         :param model_csv_file: 模型数据文件路径
         :param ignore_columns: 忽略的列名列表
+        :param mining_options: 传给 mining() 的其余参数，如 engine、workers、max_antecedent_len、mode
         """
-        processed_data_list = process_data_to_list(model_csv_file, ignore_columns)
-        __, self.model_rules = mining(processed_data_list, support_threshold=2, confidence_threshold=0.8)
+        self._train(partial(iter_data_rows, model_csv_file, ignore_columns), mining_options)
+
+    # 加载保存的二进制模型
+    def load_binary_model(self, model_file: str) -> None:
+        """
+        以内存映射方式加载 save_binary_model 保存的模型，无需重新挖掘。
+        加载的模型不保留挖掘状态，不能再追加训练数据。
+
+        :param model_file: 二进制模型文件路径
+        """
+        self.model_rules = AssociationRule.load_model(model_file)
+        self.model_miner = None
+        self.training_sources = []
+        self.model_file = model_file
+
+    # 加载 save_file 保存的文本规则文件
+    def load_rules_model(self, filename: str) -> None:
+        """
+        读取已保存的 *_rules.JSON / *_inverted_index.JSON 文件作为模型，无需重新挖掘。
+        加载的模型不保留挖掘状态，不能再追加训练数据。
+
+        :param filename: 保存时使用的文件名前缀，如 'data/Rules'
+        """
+        self.model_rules = load_rules_files(filename)
+        self.model_miner = None
+        self.training_sources = []
+        self.model_file = None
+
+    # 删去被支配的规则
+    def prune_dominated_rules(self) -> None:
+        """
+        删去模型中被支配的规则（见 AssociationRule.find_dominated_rules），find_question_word 的结果不变。
+        规则会重新编号，倒排索引数据中的规则ID随之变化；追加训练数据后模型恢复为完整规则，需重新调用。
+        """
+        self.model_rules = self.model_rules.remove_dominated_rules()
+        self.model_file = None
+
+    # 保存二进制模型
+    def save_binary_model(self, model_file: str) -> None:
+        """
+        将当前模型保存为二进制模型文件。
+
+        :param model_file: 二进制模型文件路径
+        """
+        self.model_rules.save_model(model_file)
+        self.model_file = model_file
 
     # 从头开始训练模型
     def train_model_from_scratch(self,
                                  sentences: List[str],
                                  questions: List[str],
-                                 custom_dir: str) -> None:
+                                 custom_dir: str,
+                                 **mining_options) -> None:
         """
         从头开始训练模型。
 
         :param sentences: 句子列表
         :param questions: 问题列表
         :param custom_dir: 自定义目录路径
+        :param mining_options: 传给 mining() 的其余参数，如 engine、workers、max_antecedent_len、mode
+        """
+        dependency_analyzer = self._dependency_analyzer(sentences, questions, custom_dir)
+        self._train(dependency_analyzer.iter_all_information, mining_options)
+
+    # 用 mining() 训练模型
+    def _train(self, source: Callable[[], Iterable], mining_options: dict) -> None:
+        self.model_miner = None
+        self.training_sources = [source]
+        self.mining_options = mining_options
+        self._mine_training_data()
+
+    # 用 mining() 重新挖掘全部训练数据
+    def _mine_training_data(self) -> None:
+        sources = list(self.training_sources)
+        __, self.model_rules = mining(lambda: chain.from_iterable(source() for source in sources),
+                                      SUPPORT_THRESHOLD, CONFIDENCE_THRESHOLD, **self.mining_options)
+        self.model_file = None
+
+    # 在已有模型上追加训练数据
+    def add_training_data(self,
+                          sentences: List[str],
+                          questions: List[str],
+                          custom_dir: str) -> None:
+        """
+        追加训练句子并更新模型，结果与用全部句子重新训练相同。
+        训练参数都在 INCREMENTAL_MINING_OPTIONS 中时增量更新：第一次追加时由已有训练数据建立 IncrementalMiner，
+        之后只重新统计受新句子影响的项集与规则；否则（如设置了预算或规则模式）用 mining() 重新挖掘全部训练数据。
+
+        :param sentences: 新增句子列表
+        :param questions: 新增句子对应的问题列表
+        :param custom_dir: 自定义目录路径
+        """
+        if self.model_miner is None and not self.training_sources:
+            raise ValueError('尚未训练模型，无法追加训练数据')
+        dependency_analyzer = self._dependency_analyzer(sentences, questions, custom_dir)
+        source = dependency_analyzer.iter_all_information
+        if not set(self.mining_options) <= INCREMENTAL_MINING_OPTIONS:
+            self.training_sources.append(source)
+            self._mine_training_data()
+            return
+
+        if self.model_miner is None:
+            self.model_miner = IncrementalMiner(SUPPORT_THRESHOLD, CONFIDENCE_THRESHOLD,
+                                                self.mining_options.get('max_antecedent_len'),
+                                                self.mining_options.get('max_consequent_len'))
+            self.model_miner.add_transactions(chain.from_iterable(previous() for previous in self.training_sources))
+            # 训练数据已保存在增量挖掘的 FP 树中
+            self.training_sources = []
+        self.model_rules = self.model_miner.add_transactions(source())
+        self.model_file = None
+
+    # 创建依赖分析器，复用已加载的 NLP Pipeline
+    def _dependency_analyzer(self, sentences: List[str], questions: List[str], custom_dir: str) -> DependencyAnalyzer:
+        """
+        创建 DependencyAnalyzer 并分析句子。模型目录不变时复用上一次加载的 NLP Pipeline。
+
+        :param sentences: 句子列表
+        :param questions: 问题列表，分析待预测的句子时为空列表
+        :param custom_dir: 自定义模型目录
+        :return: DependencyAnalyzer 实例
+        """
+        nlp = self.nlp if self.nlp_model_dir == custom_dir else None
+        dependency_analyzer = DependencyAnalyzer(model_dir=custom_dir, _sentences_list=sentences,
+                                                 question_word_list=questions, nlp=nlp)
+        self.nlp = dependency_analyzer.nlp
+        self.nlp_model_dir = custom_dir
+        return dependency_analyzer
+
+    # 清空上一次分析的中间数据与结果
+    def clear_analysis(self) -> None:
+        """
+        清空 model_analyze 与 find_question_word 保存的全部中间数据与结果，模型与 NLP Pipeline 保留。
         """
-        dependency_analyzer = DependencyAnalyzer(model_dir=custom_dir,
-                                                 _sentences_list=sentences,
-                                                 question_word_list=questions)
-        processed_data_list = dependency_analyzer.retrieve_all_information()
-        __, self.model_rules = mining(processed_data_list, support_threshold=2, confidence_threshold=0.8)
+        self.all_inverted_index_list = []
+        self.all_structure_words_information_list = []
+        self.all_sentence_pattern_list = []
+        self.all_structure_words_in_dependencies_position_list = []
+        self.all_structure_words_and_pos_list = []
+        self.all_words_pos_list = []
+        self.all_words_dependencies_list = []
+        self.data_list = []
+        self.ans = []
 
     # 使用模型对当前数据进行处理
     def model_analyze(self, data_list: List[str], custom_dir: str) -> None:
         """
-        使用模型对输入数据进行分析。
+        使用模型对输入数据进行分析，上一次分析的中间数据与结果会被清空。
 
         :param data_list: 待分析的句子列表
         :param custom_dir: 自定义模型目录
         """
+        self.clear_analysis()
 
         # 所有句子
         self.data_list = data_list
         # 创建DependencyAnalyzer实例，传入自定义目录、句子列表和空的疑问词列表
-        dependency_analyzer = DependencyAnalyzer(model_dir=custom_dir, _sentences_list=data_list, question_word_list=[])
+        dependency_analyzer = self._dependency_analyzer(data_list, [], custom_dir)
 
         # 获取所有单词的依赖关系列表
         self.all_words_dependencies_list = dependency_analyzer.get_all_words_dependencies()
@@ -149,6 +354,9 @@ class TextAnalysisProcessor:
         self.all_sentence_pattern_list = ['疑问句' if sentence.strip().endswith('?') else '陈述句' for sentence in
                                           data_list]
 
+        # 各规则的置信度，下标为规则ID；只读取匹配到的规则，不转换整个数组
+        confidence = self.model_rules.confidence
+
         # 遍历每个句子，提取有用信息
         for (index, sentence) in enumerate(data_list):
             # 获取当前句子的结构词和词性
@@ -166,79 +374,83 @@ class TextAnalysisProcessor:
                 useful_information.append(('SENTENCE_' + str(structure_words_position[0]), structure_words_position[1]))
             self.all_structure_words_information_list.append(useful_information)
 
-            # 初始化一个临时列表，用于存放规则索引
-            temp_list = []
-            for info in useful_information:
-                if info in self.model_rules.inverted_index_dict:
-                    temp_list.append(self.model_rules.inverted_index_dict[info])
+            # 在前件集合字典树中查找前件被句子信息完全包含的规则（依赖关系带有序号，句子信息中的项互不相同）
+            rule_ids = self.model_rules.match(useful_information)
 
-            # 如果临时列表非空，使用heapq.merge合并所有规则索引
-            if temp_list:
-                merge_index_list = list(heapq.merge(*temp_list))
-            else:
-                merge_index_list = []
-
-            result_index_list = []
-
-            now_idx = 0
-            while now_idx < len(merge_index_list):
-                value = list(merge_index_list[now_idx])
-                next_idx = now_idx
-                while (next_idx + 1 < len(merge_index_list) and merge_index_list[next_idx + 1][0] ==
-                       merge_index_list[next_idx][0]):
-                    next_idx += 1
-                value[1] -= next_idx - now_idx + 1
-                if value[1] == 0:
-                    result_index_list.append(tuple(value))
-                now_idx = next_idx + 1
-
-            # 按 置信度 降序排序规则索引列表
-            result_index_list.sort(key=lambda _x: -_x[2])
-            self.all_inverted_index_list.append(result_index_list)
-
-    # 枚举所有的前件组合
-    def _dfs(self, position_index: int, used_value_set: set, data_list: List[set], confidence_list: List[float], word,
-             confidence: float, ans: List[Tuple[str, float]]) -> None:
-        """
-        深度优先搜索，寻找可能的特征集合。
-
-        :param position_index: 当前处理的位置索引
-        :param used_value_set: 当前已使用的特征集合
-        :param data_list: 待选择的特征集合列表
-        :param confidence_list: 对应的置信度列表
-        :param word: Word 实例，用于推导疑问词
-        :param confidence: 当前的置信度
-        :param ans: 存储结果的列表
-        """
-
-        # 基本情况：如果已经处理完data_list中的所有元素
-        if position_index == len(data_list):
-            # 检查当前集合的合法性
-            if used_value_set:
-                ans.extend(word.check_legality(used_value_set, confidence))
-            return
+            # 按 置信度 降序排序规则索引列表，置信度相同时规则ID小的在前
+            rules_confidence = [(rule_id, float(confidence[rule_id])) for rule_id in rule_ids]
+            rules_confidence.sort(key=lambda _x: -_x[1])
+            self.all_inverted_index_list.append([(rule_id, 0, value) for rule_id, value in rules_confidence])
 
-        # 获取当前位置的元素及其对应的置信度
-        current_item = data_list[position_index]
-        current_confidence = confidence_list[position_index]
+    # 计算每个单词可能作为疑问词的置信度并排序
+    @staticmethod
+    def _rank_question_words(consequent_list: List[Set[Tuple[str, ...]]], confidence_list: List[float],
+                             word: Word, top_k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        对句子中的每个单词，在互不相交、且都被该单词特征包含的后件组合中取置信度乘积的最大值，按置信度降序返回。
 
-        # 检查是否可以从当前位置向used_value_set添加元素
-        if not used_value_set.intersection(current_item):
-            # 临时扩展used_value_set，加入当前位置的元素
-            used_value_set.update(current_item)
-            # 递归处理下一个位置
-            self._dfs(position_index + 1, used_value_set, data_list, confidence_list, word,
-                      confidence * current_confidence, ans)
-            # 恢复used_value_set的原始状态
-            used_value_set.difference_update(current_item)
+        置信度都不超过 1，组合中再加入后件不会使乘积变大，因此单词的最大置信度就是被其包含的后件的最大置信度，
+        只有置信度为 1 的后件可以与之组合而乘积不变。后件按置信度降序处理，单词第一次被后件包含时即得到其最大置信度；
+        当前后件的置信度是尚未出现的单词能达到的上界，已得到 top_k 个单词且上界低于第 top_k 个单词的置信度时停止。
+        置信度相同的单词按原先逐一枚举后件组合时首次得到该置信度的顺序排列：
+        枚举顺序中越早选入后件的组合越靠前，同一组合中按单词在句子中的顺序排列。
 
-        # 递归调用，跳过当前位置的元素（不添加任何新元素）
-        self._dfs(position_index + 1, used_value_set, data_list, confidence_list, word, confidence, ans)
+        :param consequent_list: 互不相同的后件集合列表
+        :param confidence_list: 对应的置信度列表
+        :param word: Word 实例
+        :param top_k: 只返回置信度最高的前 top_k 个单词，None 表示返回全部
+        :return: 单词及其置信度列表，按置信度降序排列
+        """
+        best_dict: Dict[int, int] = {}  # 单词编号 -> 包含该单词的置信度最高（相同时下标最小）的后件
+        ones_dict: Dict[int, List[int]] = {}  # 单词编号 -> 包含该单词的置信度为 1 的后件
+        kth_confidence = None
+        # 稳定排序，置信度相同时下标小的在前
+        for index in sorted(range(len(consequent_list)), key=lambda _x: -confidence_list[_x]):
+            confidence = confidence_list[index]
+            if kth_confidence is not None and confidence < kth_confidence:
+                break
+            # 每个后件只与倒排索引求一次与，得到包含它的全部单词
+            words_mask = word.matching_words_mask(consequent_list[index])
+            while words_mask:
+                lowest = words_mask & -words_mask
+                word_index = lowest.bit_length() - 1
+                words_mask ^= lowest
+                if word_index not in best_dict:
+                    best_dict[word_index] = index
+                    if top_k is not None and len(best_dict) == top_k:
+                        kth_confidence = confidence
+                if confidence == 1.0:
+                    ones_dict.setdefault(word_index, []).append(index)
+
+        ranked = []
+        for word_index, best in best_dict.items():
+            confidence = confidence_list[best]
+            if confidence == 1.0:
+                # 枚举顺序中最早出现的组合：依次选入与已选后件不相交的置信度为 1 的后件
+                used_mask = 0
+                combination = []
+                for index in ones_dict[word_index]:
+                    consequent_mask = word.feature_mask(consequent_list[index])
+                    if not used_mask & consequent_mask:
+                        used_mask |= consequent_mask
+                        combination.append(index)
+            else:
+                combination = [best]
+            # 组合的先后顺序：在第一个不同的位置上含有更小下标的组合在前，末尾补上后件数作为哨兵
+            combination.append(len(consequent_list))
+            ranked.append((-confidence, combination, word_index, word.words[word_index]))
+        ranked.sort()
+        if top_k is not None:
+            ranked = ranked[:top_k]
+        return [(_word, -negative_confidence) for negative_confidence, _, _, _word in ranked]
 
     # 查找每个句子的可能疑问词
-    def find_question_word(self) -> None:
+    def find_question_word(self, top_k: Optional[int] = None) -> None:
         """
         查找每个句子的可能疑问词并更新结果列表。
+
+        :param top_k: 每个句子只保留置信度最高的前 top_k 个疑问词，None 表示保留全部；
+                      结果与保留全部后截取前 top_k 个相同
         """
         # 初始化
         self.ans = []
@@ -246,29 +458,13 @@ class TextAnalysisProcessor:
             # 获取唯一的倒排索引及其置信度
             unique_inverted_index_consequent_list, unique_inverted_index_confidence_list = (
                 self._get_unique_inverted_index(index))
-            # print(f'unique_inverted_index_consequent_list: {unique_inverted_index_consequent_list}\n'
-            #       f'unique_inverted_index_confidence_list: {unique_inverted_index_confidence_list}\n'
-            #       f'words_pos:{self.all_words_pos_list[index]}\n'
-            #       f'dependencies: {self.all_words_dependencies_list[index]}\n'
-            #       f'structure_words_and_pos:{self.all_structure_words_and_pos_list[index]}\n')
 
             # 初始化Word实例
             word = Word(self.all_words_pos_list[index], self.all_words_dependencies_list[index],
                         self.all_structure_words_and_pos_list[index])
-            temp_ans = []
 
-            # 执行深度优先搜索
-            self._dfs(0, set(), unique_inverted_index_consequent_list, unique_inverted_index_confidence_list, word, 1.0,
-                      temp_ans)
-
-            # 按置信度递减排序
-            temp_ans.sort(key=lambda x: -x[1])
-
-            # 去重的辅助集合
-            having_value = set()
-            ans = [(item, confidence) for item, confidence in temp_ans if
-                   item not in having_value and not having_value.add(item)]
-            self.ans.append(ans)
+            self.ans.append(self._rank_question_words(unique_inverted_index_consequent_list,
+                                                      unique_inverted_index_confidence_list, word, top_k))
 
     #  获取唯一的倒排索引及其对应的最大置信度
     def _get_unique_inverted_index(self, index: int) -> Tuple[List[Set[str]], List[float]]:
@@ -278,15 +474,15 @@ class TextAnalysisProcessor:
         :param index: 句子在列表中的索引
         :return: 两个列表，第一个是包含唯一后件集合的列表，第二个是对应的最大置信度列表
         """
-        # 使用字典存储每个唯一后件及其最大置信度
+        # 使用字典存储每个唯一后件（哈希值集合）及其最大置信度
         unique_inverted_index_dict: Dict[frozenset, float] = {}
 
         # 遍历倒排索引列表，更新字典中的最大置信度
         for inverted_index in self.all_inverted_index_list[index]:
             rule_id = inverted_index[0]
             # 后件转换为集合并使用不可变集合(frozenset)作为字典的键
-            consequent = frozenset(self.model_rules.rules_list[rule_id][1])
-            confidence = self.model_rules.rules_list[rule_id][2]
+            consequent = frozenset(self.model_rules.get_consequent(rule_id))
+            confidence = float(self.model_rules.confidence[rule_id])
 
             # 更新字典中的最大置信度
             if consequent in unique_inverted_index_dict:
@@ -294,12 +490,91 @@ class TextAnalysisProcessor:
             else:
                 unique_inverted_index_dict[consequent] = confidence
 
-        # 将字典的键（集合形式的后件）和对应的最大置信度转换为列表
-        unique_inverted_index_consequent_list = [set(consequent) for consequent in unique_inverted_index_dict.keys()]
+        # 将字典的键（集合形式的后件）解码后和对应的最大置信度转换为列表
+        unique_inverted_index_consequent_list = [set(self.model_rules.decode_items(consequent))
+                                                 for consequent in unique_inverted_index_dict.keys()]
         unique_inverted_index_confidence_list = list(unique_inverted_index_dict.values())
 
         return unique_inverted_index_consequent_list, unique_inverted_index_confidence_list
 
+    # 分批分析句子并逐句生成结果
+    def analyze_stream(self,
+                       sentences: Iterable[str],
+                       custom_dir: str,
+                       batch_size: int = DEFAULT_BATCH_SIZE,
+                       top_k: Optional[int] = None) -> Iterator[dict]:
+        """
+        每次读取 batch_size 个句子，完成依赖分析、规则匹配与疑问词查找后逐句生成结果，并清空该批的中间数据，
+        内存占用只与批大小有关，与语料总量无关。NLP Pipeline 在各批之间复用。
+
+        :param sentences: 待分析的句子，可以是生成器，只遍历一次
+        :param custom_dir: 自定义模型目录
+        :param batch_size: 每批分析的句子数
+        :param top_k: 每个句子只保留置信度最高的前 top_k 个疑问词，None 表示保留全部
+        :return: 生成器，每个句子生成一条与 write_simplified_results_to_file 相同格式的结果，index 为全局序号
+        """
+        for batch, start in split_batches(sentences, batch_size):
+            yield from self._analyze_batch(batch, custom_dir, start, top_k)
+
+    # 多进程分批分析句子
+    def analyze_parallel(self,
+                         sentences: Iterable[str],
+                         custom_dir: str,
+                         workers: Optional[int] = None,
+                         batch_size: int = DEFAULT_BATCH_SIZE,
+                         top_k: Optional[int] = None) -> Iterator[dict]:
+        """
+        与 analyze_stream 相同，但各批句子交给多个进程分析，结果按输入顺序逐句生成。
+        模型以二进制模型文件共享：各进程只接收文件路径，以内存映射方式加载，规则与前件集合字典树由操作系统按页共享而不复制。
+        模型不是由 load_binary_model 加载或 save_binary_model 保存的，会先保存到临时文件，结束后删除。
+        每个进程各自加载一次 NLP Pipeline。
+
+        :param sentences: 待分析的句子，可以是生成器，只遍历一次
+        :param custom_dir: 自定义模型目录
+        :param workers: 进程数，None 表示使用全部 CPU
+        :param batch_size: 每批分析的句子数
+        :param top_k: 每个句子只保留置信度最高的前 top_k 个疑问词，None 表示保留全部
+        :return: 生成器，结果与 analyze_stream 相同
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        model_file = self.model_file
+        temporary = model_file is None
+        if temporary:
+            file_descriptor, model_file = tempfile.mkstemp(suffix='.bin')
+            os.close(file_descriptor)
+            self.model_rules.save_model(model_file)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_inference_worker,
+                                     initargs=(model_file, custom_dir)) as executor:
+                batches = ((batch, start, top_k) for batch, start in split_batches(sentences, batch_size))
+                # 同时在途的批数有上限，结果返回后立即生成，内存中不会同时保存全部句子
+                for results in map_in_order(executor, _analyze_shard, batches, workers * 2):
+                    yield from results
+        finally:
+            if temporary:
+                os.remove(model_file)
+
+    def _analyze_batch(self, batch: List[str], custom_dir: str, start: int, top_k: Optional[int]) -> List[dict]:
+        """
+        分析一批句子，返回结果并清空中间数据。
+        """
+        self.model_analyze(batch, custom_dir)
+        self.find_question_word(top_k)
+        results = [self._result_entry(i, start) for i in range(len(batch))]
+        self.clear_analysis()
+        return results
+
+    def _result_entry(self, i: int, start: int = 0) -> dict:
+        """
+        第 i 个句子的简要结果。
+        """
+        return {
+            "index": start + i + 1,
+            "sentence": self.data_list[i],
+            "疑问词": self.ans[i]
+        }
+
     # 将详细结果信息写入文件
     def write_results_to_file(self, output_file: str) -> None:
         """
@@ -325,14 +600,7 @@ class TextAnalysisProcessor:
         """
         将结果写入文件。
         """
-        results = []
-        for i, sentence in enumerate(self.data_list):
-            result_entry = {
-                "index": i + 1,
-                "sentence": sentence,
-                "疑问词": self.ans[i]
-            }
-            results.append(result_entry)
+        results = [self._result_entry(i) for i in range(len(self.data_list))]
 
         with open(output_file, 'w', encoding='utf-8') as file:
             json.dump(results, file, ensure_ascii=False, indent=4)
@@ -342,3 +610,19 @@ class TextAnalysisProcessor:
         将结果写入文件。
         """
         self.model_rules.save_file(output_file)
+
+
+# 子进程中的推理模型，由 _init_inference_worker 设置
+_inference_processor: Optional[TextAnalysisProcessor] = None
+_inference_model_dir = None
+
+
+def _init_inference_worker(model_file, custom_dir):
+    global _inference_processor, _inference_model_dir
+    _inference_processor = TextAnalysisProcessor()
+    _inference_processor.load_binary_model(model_file)
+    _inference_model_dir = custom_dir
+
+
+def _analyze_shard(batch, start, top_k):
+    return _inference_processor._analyze_batch(batch, _inference_model_dir, start, top_k)
@@ -196,50 +196,56 @@
 #     rules.get_original_data(tree.ItemHasher)
 #
 #     return patterns_list, rules
-import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
+from utils.ArrayTrie import ArrayTrie
 from utils.AssociationRule import AssociationRule
+from utils.Eclat import Eclat
+from utils.FPGrowth import FPGrowth
 from utils.ItemHasher import ItemHasher
-
-
-class TrNode(object):
-    def __init__(self, value, count):
-        self.value = value
-        self.count = count
-        self.children = []
-        self.useful = True
-
-    def has_child(self, value):
-        for node in self.children:
-            if node.value == value:
-                return True
-        return False
-
-    def get_child(self, value):
-        for node in self.children:
-            if node.value == value:
-                return node
-        return None
-
-    def add_child(self, value, count=1):
-        child = TrNode(value, count)
-        self.children.append(child)
-        return child
+from utils.MiningBudgetExceeded import MiningBudgetExceeded
 
 
 class TrieTree(object):
-    def __init__(self, transactions, threshold, root_value='Root', root_count=0):
+    def __init__(self, transactions, threshold, root_count=0, engine='fpgrowth', workers=1,
+                 max_antecedent_len=None, max_consequent_len=None, max_nodes=None):
         """
-        transactions: list 数据集
+        transactions: 数据集，需可重复遍历：列表、每次迭代都重新读取的对象，或每次调用返回新迭代器的函数
         threshold:  阈值
+        engine:     挖掘引擎，'fpgrowth' 通过条件模式基挖掘频繁项集，'bitset' 通过位集求交挖掘频繁项集，
+                    'trie' 逐条插入事务的全部子集
+        workers:    进程数，大于 1 时将事务切分为分片，在各进程中分别计数后合并
+        max_antecedent_len / max_consequent_len: 项集中前件项 / 后件项的最大个数，None 表示不限制
+        max_nodes:  字典树结点数（'trie'）或频繁项集数（'fpgrowth'、'bitset'）的上限，超出时抛出 MiningBudgetExceeded
         frequent:   处理后的数据集(字典形式，存储大于等于阈值的所有单项)
+        trie:       以并行数组存储的字典树，结点均以下标表示
         初始化树。
         """
+        if engine not in ('fpgrowth', 'bitset', 'trie'):
+            raise ValueError(f"未知的挖掘引擎：{engine}")
+
         self.ItemHasher = ItemHasher()
-        self.frequent = self.find_frequent_items(transactions, threshold)
-        self.root = self.build_fptree(
-            transactions, root_value,
-            root_count, self.frequent)
+        self.trie = ArrayTrie(root_count)
+        self.max_antecedent_len = max_antecedent_len
+        self.max_consequent_len = max_consequent_len
+        self.max_nodes = max_nodes
+        if workers > 1:
+            self.frequent = self.find_frequent_items_parallel(transactions, threshold, workers)
+        else:
+            self.frequent = self.find_frequent_items(transactions, threshold)
+        # 频繁项的全局名次表，之后排序与拆分事务只需查表
+        self.ItemHasher.build_rank(self.frequent)
+        if workers > 1:
+            counter = self.count_transactions_parallel(transactions, threshold, engine, workers)
+        else:
+            counter = self.count_transactions(transactions, threshold, engine)
+
+        if engine == 'trie':
+            self.root = self.trie.ROOT
+        else:
+            # 只用挖掘出的频繁项集构建字典树
+            self.root = self.build_pattern_tree(counter.mine(), self.frequent)
 
     def find_frequent_items(self, transactions, threshold):
         """
@@ -247,9 +253,8 @@ class TrieTree(object):
         """
         items = {}
 
-        for transaction in transactions:
-            for item in transaction:
-                item = self.ItemHasher.hash(item)
+        for transaction in iter_transactions(transactions):
+            for item in self.ItemHasher.hash_many(transaction):
                 if item in items:
                     items[item] += 1
                 else:
@@ -259,83 +264,181 @@ class TrieTree(object):
                 del items[key]
         return items
 
-    @staticmethod
-    def generate_subsets(items):
-        subsets = []
-        for r in range(1, len(items) + 1):
-            subsets.extend(itertools.combinations(items, r))
-        return subsets
+    def find_frequent_items_parallel(self, transactions, threshold, workers):
+        """
+        各分片在子进程中统计原始项的出现次数，再按分片顺序合并。
+        合并后项的首次出现顺序与串行统计一致，因此哈希值也与 find_frequent_items 一致。
+        """
+        counts = {}
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shards = ((shard,) for _, shard in split_shards(transactions, workers))
+            for shard_count in map_in_order(executor, count_items, shards, workers * 2):
+                for item, count in shard_count.items():
+                    counts[item] = counts.get(item, 0) + count
+
+        items = {}
+        for item, count in zip(self.ItemHasher.hash_many(counts), counts.values()):
+            if count >= threshold:
+                items[item] = count
+        return items
+
+    def sort_items(self, transaction):
+        """
+        哈希事务中的项，筛选出频繁项并按全局顺序排序，前半部分全为前件的项，后半部分全为后件的项。
+        需先调用 ItemHasher.build_rank。
+        """
+        pre_items, suff_items = self.ItemHasher.order_items(self.ItemHasher.hash_many(transaction))
+        return pre_items + suff_items
+
+    def count_transactions(self, transactions, threshold, engine, first_tid=0):
+        """
+        按挖掘引擎对事务计数，需先由 self.frequent 调用 ItemHasher.build_rank。
+
+        transactions: 原始数据集（或其中一个分片）
+        first_tid:    第一条事务的编号，分片计数时为分片在全部事务中的起始位置
+        返回计数结构：
+            'fpgrowth' 每条事务只插入 FP 树一次，之后由条件模式基挖掘频繁项集，返回 FPGrowth
+            'bitset'   每个频繁单项记录为事务编号位集，之后由位集求交挖掘频繁项集，返回 Eclat
+            'trie'     将事务的全部子集插入 self.trie，返回 self.trie
+        """
+        if engine == 'trie':
+            self.build_subset_tree(transactions)
+            return self.trie
+
+        if engine == 'fpgrowth':
+            counter = FPGrowth(self.ItemHasher.get_must_antecedent, threshold, first_tid,
+                               self.max_antecedent_len, self.max_consequent_len, self.max_nodes)
+        else:
+            ordered_items = self.ItemHasher.ranked_items.tolist()
+            counter = Eclat(ordered_items, self.ItemHasher.get_must_antecedent, threshold, first_tid,
+                            self.max_antecedent_len, self.max_consequent_len, self.max_nodes)
+        for transaction in iter_transactions(transactions):
+            counter.add_transaction(self.sort_items(transaction))
+        return counter
+
+    def count_transactions_parallel(self, transactions, threshold, engine, workers):
+        """
+        将事务切分为连续的分片，在子进程中分别计数，再按分片顺序合并为全局计数结构。
+        按顺序合并的字典树与串行插入得到的字典树完全相同，FP 树与位集则使用全局事务编号。
+        同时在途的分片数有上限，分片计数结果返回后立即合并，内存中不会同时保存全部事务。
+        """
+        counter = None
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_count_worker,
+                                 initargs=(self, threshold, engine)) as executor:
+            shards = split_shards(transactions, workers)
+            for partial_counter in map_in_order(executor, _count_shard, shards, workers * 2):
+                if engine == 'trie':
+                    self.trie.merge(partial_counter)
+                    self.check_node_budget()
+                    counter = self.trie
+                elif counter is None:
+                    counter = partial_counter
+                else:
+                    counter.merge(partial_counter)
+
+        if counter is None:
+            # 没有任何事务
+            counter = self.count_transactions([], threshold, engine)
+        return counter
+
+    def build_pattern_tree(self, itemsets, frequent):
+        """
+        由频繁项集构建字典树，结构与 build_subset_tree 剪去非频繁结点后的字典树一致。
+
+        itemsets: 字典，键为按全局顺序排列的项集，值为（支持度，最早出现的事务编号）
+        """
+        # 逐条插入子集时，同一结点的子结点按创建先后排列：先按最早出现的事务排序，
+        # 同一事务内后件先于前件创建，再按全局顺序排列。父结点的项集更短且不会更晚出现，因此总是先于子结点创建。
+        def creation_order(entry):
+            itemset, (_, tid) = entry
+            last = itemset[-1]
+            must_antecedent = self.ItemHasher.get_must_antecedent(last)
+            return tid, len(itemset), must_antecedent, -frequent[last], last
+
+        root = self.trie.ROOT
+        nodes = {(): root}
+        for itemset, (count, _) in sorted(itemsets.items(), key=creation_order):
+            nodes[itemset] = self.trie.add_child(nodes[itemset[:-1]], itemset[-1], count)
+        return root
 
-    def build_fptree(self, transactions, root_value, root_count, frequent):
+    def build_subset_tree(self, transactions):
         # transactions 原始数据集
-        # frequent hash后的频繁项集
-
-        # 创建根结点   (结点名字，结点次数)
-        root = TrNode(root_value, root_count)
-
-        for transaction in transactions:
-            # 筛选出 出现次数大于等于 支持度 的项
-            sorted_items = []
-            for x in transaction:
-                # 先哈希再判断是否存在
-                x = self.ItemHasher.hash(x)
-                if x in frequent:
-                    sorted_items.append(x)
-
-            # 排序，使项排成 前半部分全为前件的项  后半部分全为后件的项
-            sorted_items.sort(key=lambda temp_x: (
-                not self.ItemHasher.get_must_antecedent(temp_x),  # 如果是前件，优先级高
-                -frequent[temp_x],  # 频次降序
-                temp_x  # 按照项本身排序
-            ))
-
-            pre_subsets = []
-            suff_subsets = []
-
-            for item in sorted_items:
-                if self.ItemHasher.get_must_antecedent(item) is True:  # 如果是前件
-                    pre_subsets.append(item)
-                else:  # 否则是后件
-                    suff_subsets.append(item)
-
-            pre_subsets = self.generate_subsets(pre_subsets)
-            suff_subsets = self.generate_subsets(suff_subsets)
-
-            if len(pre_subsets) > 0 and len(suff_subsets) > 0:
-                for pre_items in pre_subsets:
-                    for suff_items in suff_subsets:
-                        self.insert_tree(pre_items + suff_items, root, 1)
-            for pre_items in pre_subsets:
-                self.insert_tree(pre_items, root, 1)
+        root = self.trie.ROOT
+
+        for transaction in iter_transactions(transactions):
+            # 按名次排序并拆分为前件项与后件项
+            pre_items, suff_items = self.ItemHasher.order_items(self.ItemHasher.hash_many(transaction))
+            self.insert_subsets(pre_items, suff_items, root, 1)
+            self.check_node_budget()
         return root
 
+    def check_node_budget(self):
+        if self.max_nodes is not None and len(self.trie) - 1 > self.max_nodes:
+            raise MiningBudgetExceeded(f'字典树结点数超过上限 {self.max_nodes}')
+
+    def insert_subsets(self, pre_items, suff_items, node, count):
+        """
+        插入一条事务的全部子集：非空的前件子集，以及非空前件子集与非空后件子集的组合。
+        子集沿字典树深度优先展开，共享前缀的结点每条事务只访问一次。
+        前件项数、后件项数超过 max_antecedent_len、max_consequent_len 的子集不会展开。
+
+        pre_items:  事务中已排序的前件项
+        suff_items: 事务中已排序的后件项
+        """
+        ensure_child = self.trie.ensure_child
+        counts = self.trie.count
+        pre_len = len(pre_items)
+        suff_len = len(suff_items)
+        max_pre = pre_len if self.max_antecedent_len is None else min(pre_len, self.max_antecedent_len)
+        max_suff = suff_len if self.max_consequent_len is None else min(suff_len, self.max_consequent_len)
+        # 栈中元素：(结点, 可扩展的下一个前件下标, 可扩展的下一个后件下标, 路径中前件项数, 路径中后件项数)
+        # 根结点只能扩展前件；路径中出现后件后只能继续扩展后件；无法再扩展的结点不入栈
+        stack = [(node, 0, suff_len, 0, 0)]
+        while stack:
+            node, pre_start, suff_start, pre_depth, suff_depth = stack.pop()
+            # 与逐个插入子集时的创建顺序一致：同一结点下先创建后件子结点，再创建前件子结点
+            if suff_depth < max_suff:
+                for j in range(suff_start, suff_len):
+                    child = ensure_child(node, suff_items[j])
+                    counts[child] += count
+                    if j + 1 < suff_len and suff_depth + 1 < max_suff:
+                        stack.append((child, pre_len, j + 1, pre_depth, suff_depth + 1))
+            if pre_depth < max_pre:
+                for i in range(pre_start, pre_len):
+                    child = ensure_child(node, pre_items[i])
+                    counts[child] += count
+                    if (i + 1 < pre_len and pre_depth + 1 < max_pre) or max_suff > 0:
+                        stack.append((child, i + 1, 0, pre_depth + 1, 0))
+
     def insert_tree(self, items, node, count):
-        if len(items) > 0:
-            first = items[0]
-            child = node.get_child(first)
-            if child is None:
-                child = node.add_child(first, 0)
-            self.insert_tree(items[1:], child, count)
-        else:
-            node.count += count
+        for item in items:
+            node = self.trie.ensure_child(node, item)
+        self.trie.count[node] += count
 
     def do_mine_patterns(self, node, support_threshold, path, result_list):
-        result_list.append((path, node.count))
-        for child in node.children:
-            if child.count >= support_threshold:
-                self.do_mine_patterns(child, support_threshold, path + [child.value], result_list)
+        trie = self.trie
+        result_list.append((path, trie.count[node]))
+        for child in trie.children(node):
+            if trie.count[child] >= support_threshold:
+                self.do_mine_patterns(child, support_threshold, path + [trie.item[child]], result_list)
             else:
-                child.useful = False
+                trie.useful[child] = 0
 
     def mine_patterns(self, node, support_threshold, result_list):
-        for child in node.children:
-            if child.count >= support_threshold:
-                self.do_mine_patterns(child, support_threshold, [child.value], result_list)
+        trie = self.trie
+        for child in trie.children(node):
+            if trie.count[child] >= support_threshold:
+                self.do_mine_patterns(child, support_threshold, [trie.item[child]], result_list)
             else:
-                child.useful = False
+                trie.useful[child] = 0
 
-    def do_mine_association_rules(self, node, pre_list, suff_list, confidence_threshold, patterns_dict, rules):
-        if not node.useful:
+    def do_mine_association_rules(self, node, pre_list, suff_list, confidence_threshold, patterns_dict, rules,
+                                  max_rules=None, redundant=None):
+        """
+        redundant: 不产生关联规则的项集，见 find_redundant_patterns；None 表示输出全部规则
+        """
+        trie = self.trie
+        if not trie.useful[node]:
             return
 
         if len(suff_list) > 0:
@@ -343,36 +446,305 @@ class TrieTree(object):
 
         if len(suff_list) != 0:
             assert tuple(pre_list) in patterns_dict, f'错误！前件不存在！{tuple(pre_list)}'
-            confidence = node.count / patterns_dict[tuple(pre_list)]
+            confidence = trie.count[node] / patterns_dict[tuple(pre_list)]
             assert confidence <= 1.0, f'错误置信度大于1！  {confidence}'
             if confidence < confidence_threshold:
                 return
 
-            #  添加关联规则
-            rules.add_rule(tuple(pre_list), tuple(suff_list), confidence)
+            if redundant is None or tuple(pre_list + suff_list) not in redundant:
+                if max_rules is not None and rules.rules_id >= max_rules:
+                    raise MiningBudgetExceeded(f'关联规则数超过上限 {max_rules}')
+                #  添加关联规则
+                rules.add_rule(tuple(pre_list), tuple(suff_list), confidence, trie.count[node])
 
-            for child in node.children:
-                suff_list.append(child.value)
+            for child in trie.children(node):
+                suff_list.append(trie.item[child])
                 self.do_mine_association_rules(child, pre_list, suff_list, confidence_threshold,
-                                               patterns_dict, rules)
+                                               patterns_dict, rules, max_rules, redundant)
                 suff_list.pop()
         else:
-            for child in node.children:
-                # 必须为前件
-                if self.ItemHasher.get_must_antecedent(child.value) is True:
-                    pre_list.append(child.value)
-                    self.do_mine_association_rules(child, pre_list, suff_list, confidence_threshold,
-                                                   patterns_dict, rules)
-                    pre_list.pop()
-                else:
-                    suff_list.append(child.value)
-                    self.do_mine_association_rules(child, pre_list, suff_list, confidence_threshold,
-                                                   patterns_dict, rules)
-                    suff_list.pop()
+            self.mine_children_association_rules(trie.children(node), pre_list, suff_list, confidence_threshold,
+                                                 patterns_dict, rules, max_rules, redundant)
 
+    def mine_children_association_rules(self, children, pre_list, suff_list, confidence_threshold, patterns_dict,
+                                        rules, max_rules=None, redundant=None):
+        """
+        依次挖掘前件路径上各子结点的子树，children 可以是某个结点全部子结点的一部分。
+        """
+        trie = self.trie
+        # 前件不是闭项集时，以它为前件的规则都不输出，后件子树无需遍历
+        skip_consequents = redundant is not None and len(pre_list) > 0 and tuple(pre_list) in redundant
+        for child in children:
+            # 必须为前件
+            if self.ItemHasher.get_must_antecedent(trie.item[child]) is True:
+                pre_list.append(trie.item[child])
+                self.do_mine_association_rules(child, pre_list, suff_list, confidence_threshold,
+                                               patterns_dict, rules, max_rules, redundant)
+                pre_list.pop()
+            elif not skip_consequents:
+                suff_list.append(trie.item[child])
+                self.do_mine_association_rules(child, pre_list, suff_list, confidence_threshold,
+                                               patterns_dict, rules, max_rules, redundant)
+                suff_list.pop()
+
+    def subtree_size(self, node):
+        """
+        统计以 node 为根、参与关联规则挖掘的子树结点数。
+        """
+        trie = self.trie
+        size = 0
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if trie.useful[node]:
+                size += 1
+                stack.extend(trie.children(node))
+        return size
+
+    def partition_root_children(self, parts):
+        """
+        将根结点的子结点按顺序切分为至多 parts 段连续的分组，使各组子树结点数大致相同。
+        分组保持原有顺序，按组依次合并挖掘结果即可得到与串行挖掘相同的规则编号。
+        """
+        children = list(self.trie.children(self.root))
+        sizes = [self.subtree_size(child) for child in children]
+        target = sum(sizes) / max(parts, 1)
+        groups = []
+        group = []
+        group_size = 0
+        for child, size in zip(children, sizes):
+            group.append(child)
+            group_size += size
+            if group_size >= target and len(groups) < parts - 1:
+                groups.append(group)
+                group = []
+                group_size = 0
+        if group:
+            groups.append(group)
+        return groups
+
+
+DEFAULT_SHARD_SIZE = 10000  # 无法得知事务总数时每个分片的事务数
+
+
+def iter_transactions(transactions):
+    """
+    返回事务的一次新的遍历。
+    transactions 可以是列表等可重复遍历的对象，也可以是每次调用都返回新迭代器的函数（如生成器函数）。
+    迭代器、生成器对象只能遍历一次，而挖掘需要多次遍历事务，因此直接报错。
+    """
+    if callable(transactions):
+        return iter(transactions())
+    iterator = iter(transactions)
+    if iterator is transactions:
+        raise ValueError('事务只能遍历一次，请传入列表、可重复遍历的对象或返回迭代器的函数')
+    return iterator
+
+
+def split_shards(transactions, parts, shard_size=None):
+    """
+    将事务依次切分为连续分片，逐个生成，不会一次读入全部事务。
+    事务数已知（如列表）时切分为至多 parts 个分片，否则每个分片 shard_size 条事务。
+
+    Yields:
+    - (分片起始位置, 分片)
+    """
+    if shard_size is None:
+        if hasattr(transactions, '__len__'):
+            shard_size = max((len(transactions) + parts - 1) // parts, 1)
+        else:
+            shard_size = DEFAULT_SHARD_SIZE
+    start = 0
+    shard = []
+    for transaction in iter_transactions(transactions):
+        shard.append(transaction)
+        if len(shard) == shard_size:
+            yield start, shard
+            start += shard_size
+            shard = []
+    if shard:
+        yield start, shard
+
+
+def map_in_order(executor, fn, args_iterable, window):
+    """
+    按提交顺序返回 fn(*args) 的结果，同时在途的任务不超过 window 个，
+    避免 executor.map 一次性取出全部参数。
+    """
+    pending = deque()
+    for args in args_iterable:
+        pending.append(executor.submit(fn, *args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def count_items(transactions):
+    """
+    统计一个分片中各原始项的出现次数，字典按项首次出现的顺序排列。
+    """
+    items = {}
+    for transaction in transactions:
+        for item in transaction:
+            items[item] = items.get(item, 0) + 1
+    return items
+
+
+# 子进程中的计数数据，由 _init_count_worker 设置
+_count_tree = None
+_count_threshold = None
+_count_engine = None
+
+
+def _init_count_worker(tree, threshold, engine):
+    global _count_tree, _count_threshold, _count_engine
+    _count_tree = tree
+    _count_threshold = threshold
+    _count_engine = engine
+
+
+def _count_shard(first_tid, transactions):
+    _count_tree.trie = ArrayTrie()
+    return _count_tree.count_transactions(transactions, _count_threshold, _count_engine, first_tid)
+
+
+# 子进程中的只读挖掘数据，由 _init_rules_worker 设置
+_worker_tree = None
+_worker_confidence_threshold = None
+_worker_patterns_dict = None
+_worker_max_rules = None
+_worker_redundant = None
+
+
+def _init_rules_worker(tree, confidence_threshold, patterns_dict, max_rules, redundant):
+    global _worker_tree, _worker_confidence_threshold, _worker_patterns_dict, _worker_max_rules, _worker_redundant
+    _worker_tree = tree
+    _worker_confidence_threshold = confidence_threshold
+    _worker_patterns_dict = patterns_dict
+    _worker_max_rules = max_rules
+    _worker_redundant = redundant
+
+
+def _mine_rules_group(children):
+    rules = AssociationRule()
+    _worker_tree.mine_children_association_rules(children, [], [], _worker_confidence_threshold,
+                                                 _worker_patterns_dict, rules, _worker_max_rules, _worker_redundant)
+    return rules
+
+
+def mine_association_rules_parallel(tree, confidence_threshold, patterns_dict, workers, max_rules=None,
+                                    redundant=None):
+    """
+    按根结点的子树分组，用进程池并行挖掘关联规则，再按分组顺序合并为一个 AssociationRule。
+    每个进程只在初始化时接收一次字典树；分组数为进程数的数倍，以平衡各进程的负载。
+
+    Parameters:
+    - tree: 已执行过 mine_patterns 的 TrieTree
+    - confidence_threshold: 置信度阈值
+    - patterns_dict: 频繁项集（哈希值元组）到支持度的字典
+    - workers: 进程数
+    - max_rules: 关联规则数上限，None 表示不限制
+    - redundant: 不产生关联规则的项集，None 表示输出全部规则
+
+    Returns:
+    - rules: 合并后的关联规则，规则编号与串行挖掘一致
+    """
+    # 计算置信度只需要纯前件项集的支持度
+    antecedent_support = {pattern: count for pattern, count in patterns_dict.items()
+                          if tree.ItemHasher.get_must_antecedent(pattern[-1])}
+    groups = tree.partition_root_children(workers * 4)
 
-def mining(transactions, support_threshold, confidence_threshold):
-    tree = TrieTree(transactions, support_threshold)
+    rules = AssociationRule()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_rules_worker,
+                             initargs=(tree, confidence_threshold, antecedent_support, max_rules,
+                                       redundant)) as executor:
+        for group_rules in executor.map(_mine_rules_group, groups):
+            rules.merge(group_rules)
+            if max_rules is not None and rules.rules_id > max_rules:
+                raise MiningBudgetExceeded(f'关联规则数超过上限 {max_rules}')
+    return rules
+
+
+RULE_MODES = ('all', 'closed', 'maximal')
+
+
+def find_redundant_patterns(patterns_dict, must_antecedent, confidence_threshold, mode):
+    """
+    找出 closed / maximal 模式下不产生关联规则的项集，只需遍历一次频繁项集，比较只差一个项的项集。
+    两种模式下前件都必须是闭项集：加入任一前件项后支持度都会下降。
+    'closed'  前件与后件的并集对后件闭合：加入任一后件项后支持度都会下降，否则更大的后件置信度相同。
+    'maximal' 后件极大：加入任一后件项后置信度都低于阈值。
+
+    Parameters:
+    - patterns_dict: 频繁项集（按全局顺序排列的哈希值元组）到支持度的字典
+    - must_antecedent: 判断项是否必须作为前件的函数
+    - confidence_threshold: 置信度阈值
+    - mode: 'closed' 或 'maximal'
+
+    Returns:
+    - redundant: 集合，包含非闭的纯前件项集，以及不输出规则的（前件 + 后件）项集
+    """
+    redundant = set()
+    for pattern, count in patterns_dict.items():
+        pre_len = 0
+        while pre_len < len(pattern) and must_antecedent(pattern[pre_len]):
+            pre_len += 1
+
+        if pre_len == len(pattern):
+            # 纯前件项集：去掉一个前件后支持度不变，则去掉后的项集不是闭项集
+            if pre_len > 1:
+                for i in range(pre_len):
+                    sub_pattern = pattern[:i] + pattern[i + 1:]
+                    if patterns_dict[sub_pattern] == count:
+                        redundant.add(sub_pattern)
+            continue
+
+        # 去掉一个后件后仍有后件时，比较同一前件下的两条规则
+        if len(pattern) - pre_len < 2:
+            continue
+        if mode == 'maximal':
+            dominated = count / patterns_dict[pattern[:pre_len]] >= confidence_threshold
+        for i in range(pre_len, len(pattern)):
+            sub_pattern = pattern[:i] + pattern[i + 1:]
+            if mode == 'closed':
+                dominated = patterns_dict[sub_pattern] == count
+            if dominated:
+                redundant.add(sub_pattern)
+    return redundant
+
+
+def mining(transactions, support_threshold, confidence_threshold, engine='fpgrowth', workers=1,
+           max_antecedent_len=None, max_consequent_len=None, max_nodes=None, max_rules=None, adaptive=False,
+           mode='all'):
+    """
+    挖掘频繁项集与关联规则。
+
+    transactions: 事务，需可重复遍历，见 iter_transactions；挖掘过程中不会把全部事务保存为列表
+    max_antecedent_len / max_consequent_len: 前件 / 后件的最大项数，构建字典树时即不再展开更长的项集
+    max_nodes: 字典树结点数（或频繁项集数）上限；max_rules: 关联规则数上限
+    adaptive:  超出预算时是否提高支持度阈值后重新挖掘；为 False 时直接抛出 MiningBudgetExceeded
+    mode:      'all' 输出全部规则；'closed' 只输出闭前件、且后件不能在支持度不变时扩大的规则；
+               'maximal' 只输出闭前件、且后件不能在满足置信度阈值时扩大的规则，见 find_redundant_patterns
+    """
+    if mode not in RULE_MODES:
+        raise ValueError(f"未知的规则模式：{mode}")
+    while True:
+        try:
+            return _mining(transactions, support_threshold, confidence_threshold, engine, workers,
+                           max_antecedent_len, max_consequent_len, max_nodes, max_rules, mode)
+        except MiningBudgetExceeded as e:
+            if not adaptive:
+                raise
+            support_threshold = max(support_threshold + 1, int(support_threshold * 1.5))
+            print(f'{e}，支持度阈值提高到 {support_threshold} 后重新挖掘')
+
+
+def _mining(transactions, support_threshold, confidence_threshold, engine, workers,
+            max_antecedent_len, max_consequent_len, max_nodes, max_rules, mode):
+    tree = TrieTree(transactions, support_threshold, engine=engine, workers=workers,
+                    max_antecedent_len=max_antecedent_len, max_consequent_len=max_consequent_len,
+                    max_nodes=max_nodes)
     patterns_list = []
     tree.mine_patterns(tree.root, support_threshold, patterns_list)
 
@@ -382,8 +754,18 @@ def mining(transactions, support_threshold, confidence_threshold):
         assert tuple(row) not in patterns_dict, f"错误！频繁项:{row} 出现重复！"
         patterns_dict[tuple(row)] = count
 
-    rules = AssociationRule()
-    tree.do_mine_association_rules(tree.root, [], [], confidence_threshold, patterns_dict, rules)
+    redundant = None
+    if mode != 'all':
+        redundant = find_redundant_patterns(patterns_dict, tree.ItemHasher.get_must_antecedent, confidence_threshold,
+                                            mode)
+
+    if workers > 1:
+        rules = mine_association_rules_parallel(tree, confidence_threshold, patterns_dict, workers, max_rules,
+                                                redundant)
+    else:
+        rules = AssociationRule()
+        tree.do_mine_association_rules(tree.root, [], [], confidence_threshold, patterns_dict, rules, max_rules,
+                                       redundant)
 
     patterns_list = [(tree.ItemHasher.get_items_list(x[0]), x[1]) for x in patterns_list]
     rules.get_original_data(tree.ItemHasher)